@@ -32,7 +32,10 @@ s = "hello world"
 # In[ ]:
 
 
-class OrderedHashtable:
+from collections import OrderedDict
+from collections.abc import ItemsView, KeysView, Mapping, MutableMapping, ValuesView
+
+class OrderedHashtable(MutableMapping):
     class Node:
         """This class is used to create nodes in the singly linked "chains" in
         each hashtable bucket."""
@@ -40,82 +43,384 @@ class OrderedHashtable:
             # don't rename the following attributes!
             self.index = index
             self.next = next
+
+    class Entry:
+        """A key/value pair in `entries`, along with the hash of the key (so
+        that it needn't be recomputed, and only keys with matching hashes are
+        compared)."""
+        __slots__ = ('hash', 'key', 'value')
+
+        def __init__(self, hash, key, value):
+            self.hash = hash
+            self.key = key
+            self.value = value
+
+    class Keys(KeysView):
+        """A view of the keys of a hashtable, in order."""
+        def __reversed__(self):
+            return reversed(self._mapping)
+
+    class Values(ValuesView):
+        """A view of the values of a hashtable, in order, which reads them
+        straight from `entries` rather than looking up each key."""
+        def __iter__(self):
+            for x in self._mapping.entries:
+                if x is not None:
+                    yield x.value
+
+        def __reversed__(self):
+            for x in reversed(self._mapping.entries):
+                if x is not None:
+                    yield x.value
+
+    class Items(ItemsView):
+        """A view of the (key, value) pairs of a hashtable, in order, which
+        reads them straight from `entries` rather than looking up each key."""
+        def __iter__(self):
+            for x in self._mapping.entries:
+                if x is not None:
+                    yield (x.key, x.value)
+
+        def __reversed__(self):
+            for x in reversed(self._mapping.entries):
+                if x is not None:
+                    yield (x.key, x.value)
+
+    MIN_BUCKETS = 8
+    REHASH_STEP = 4 # old buckets migrated per operation, in incremental mode
         
-    def __init__(self, n_buckets=1000):
+    def __init__(self, n_buckets=1000, max_load=1.0, min_load=None, incremental=False,
+                 max_tombstones=0.5):
+        """Creates a hashtable with n_buckets buckets, which doubles in size
+        whenever there are more than max_load keys per bucket, and halves in
+        size (down to MIN_BUCKETS) whenever there are fewer than min_load
+        keys per bucket. Either limit may be None, to disable that kind of
+        resizing. If incremental is True, the keys are moved to the resized
+        table a few buckets at a time, by the operations that follow, rather
+        than all at once. Deleted entries are dropped (see `compact`) once
+        they make up more than max_tombstones of `entries` (unless it is
+        None)."""
+        if max_load is not None and min_load is not None and 2 * min_load >= max_load:
+            raise ValueError('min_load must be less than half of max_load')
         # the following two variables should be used to implement the "two-tiered" 
         # ordered hashtable described in class -- don't rename them!
         self.indices = [None] * n_buckets
         self.entries = []
         self.count = 0
+        self.max_load = max_load
+        self.min_load = min_load
+        self.incremental = incremental
+        self.old_indices = None # the table being migrated from, if any
+        self.rehash_pos = 0     # the next bucket in old_indices to migrate
+        self.max_tombstones = max_tombstones
+        self.start = 0          # there are no live entries before this one
+        self.resizes = 0
+        self.compactions = 0
+
+    ### resizing ###
+
+    def _resize(self, n_buckets):
+        """Replaces the index with one of n_buckets buckets, and moves the
+        nodes over to it (right away, unless in incremental mode)."""
+        if self.old_indices is not None:
+            self._rehash_step(len(self.old_indices))
+        self.old_indices, self.indices = self.indices, [None] * n_buckets
+        self.rehash_pos = 0
+        self.resizes += 1
+        if not self.incremental:
+            self._rehash_step(len(self.old_indices))
+
+    def _migrate(self, b):
+        """Moves the nodes in bucket b of the old table to the current one."""
+        node, self.old_indices[b] = self.old_indices[b], None
+        while node:
+            nxt = node.next
+            idx = self.entries[node.index].hash % len(self.indices)
+            node.next, self.indices[idx] = self.indices[idx], node
+            node = nxt
+
+    def _rehash_step(self, n):
+        """Migrates the next n buckets of the old table, and drops the old
+        table once it has been fully migrated."""
+        end = min(self.rehash_pos + n, len(self.old_indices))
+        for b in range(self.rehash_pos, end):
+            self._migrate(b)
+        self.rehash_pos = end
+        if end == len(self.old_indices):
+            self.old_indices = None
+
+    def _bucket(self, h):
+        """Returns the index of the bucket for keys with hash h. During an
+        incremental rehash, the old bucket for h is migrated first (so that
+        all lookups need only search the current table), along with a few
+        more."""
+        if self.old_indices is not None:
+            self._migrate(h % len(self.old_indices))
+            self._rehash_step(self.REHASH_STEP)
+        return h % len(self.indices)
+
+    def _check_load(self):
+        """Grows or shrinks the table, if its load is outside the limits, or
+        compacts it, if there are too many deleted entries."""
+        n = len(self.indices)
+        if self.max_load is not None and self.count > self.max_load * n:
+            self._resize(2 * n)
+        elif (self.min_load is not None and n > self.MIN_BUCKETS
+              and self.count < self.min_load * n):
+            self._resize(max(n // 2, self.MIN_BUCKETS))
+        elif self._too_many_tombstones():
+            self.compact()
+
+    ### compaction ###
+
+    def _too_many_tombstones(self):
+        """Returns True if deleted entries make up more than max_tombstones of
+        `entries` (ignoring the first few, so small tables aren't compacted
+        over and over)."""
+        dead = len(self.entries) - self.count
+        return (self.max_tombstones is not None and dead > self.MIN_BUCKETS
+                and dead > self.max_tombstones * len(self.entries))
+
+    def compact(self):
+        """Drops the deleted entries from `entries`, and renumbers the nodes
+        in the index (in a single pass over it) to match. Any incremental
+        rehash is finished first, so that there's only one table to update."""
+        if self.old_indices is not None:
+            self._rehash_step(len(self.old_indices))
+        renumbered, live = [], [] # renumbered[i] is the new index of entry i
+        for e in self.entries:
+            renumbered.append(len(live))
+            if e is not None:
+                live.append(e)
+        for node in self.indices:
+            while node:
+                node.index = renumbered[node.index]
+                node = node.next
+        self.entries = live
+        self.start = 0
+        self.compactions += 1
+
+    ### index primitives ###
+    # The mapping API below is written in terms of these (which subclasses
+    # with a different index layout override), so that each operation probes
+    # the index for its key just once.
+
+    def _probe(self, key, h):
+        """Searches the index for key (whose hash is h), and returns its
+        location along with the number of its entry, or -1 if key is absent
+        (in which case the location is where it should be added)."""
+        idx = self._bucket(h)
+        prior, node = None, self.indices[idx]
+        while node:
+            e = self.entries[node.index]
+            if e.hash == h and (e.key is key or e.key == key):
+                return (idx, prior, node), node.index
+            prior, node = node, node.next
+        return (idx, None, None), -1
+
+    def _add(self, loc, h, key, val):
+        """Adds a new entry for key, at the location returned by a failed
+        probe for it."""
+        idx = loc[0]
+        self.indices[idx] = OrderedHashtable.Node(len(self.entries), self.indices[idx])
+        self.entries.append(OrderedHashtable.Entry(h, key, val))
+        self.count += 1
+        self._check_load()
+
+    def _remove(self, loc, ix):
+        """Removes entry ix, found at location loc by a probe."""
+        idx, prior, node = loc
+        if prior:
+            prior.next = node.next
+        else:
+            self.indices[idx] = node.next
+        self.entries[ix] = None
+        self.count -= 1
+        self._check_load()
+
+    def _renumber(self, loc, ix):
+        """Points the index at location loc to entry ix."""
+        loc[2].index = ix
+
+    def _shift_indices(self):
+        """Adds 1 to every entry number in the index."""
+        for table in (self.indices, self.old_indices or ()):
+            for node in table:
+                while node:
+                    node.index += 1
+                    node = node.next
+
+    def _reserve(self, n):
+        """Grows the table, if needed, so that it can hold n keys."""
+        if self.max_load is None:
+            return
+        size = max(len(self.indices), 1)
+        while n > self.max_load * size:
+            size *= 2
+        if size != len(self.indices):
+            self._resize(size)
+
+    ### mapping API ###
         
     def __getitem__(self, key):
-        idx = hash(key) % len(self.indices)
-        node = self.indices[idx]
-        while node:
-            if self.entries[node.index][0] == key:
-                return self.entries[node.index][1]
-            node = node.next
-        raise KeyError
+        _, ix = self._probe(key, hash(key))
+        if ix < 0:
+            raise KeyError(key)
+        return self.entries[ix].value
     
     def __setitem__(self, key, val):
-        idx = hash(key) % len(self.indices)
-        node = self.indices[idx]
-        while node:
-            if self.entries[node.index][0] == key:
-                self.entries[node.index][1] = val
-                return 
-            node = node.next
+        h = hash(key)
+        loc, ix = self._probe(key, h)
+        if ix >= 0:
+            self.entries[ix].value = val
         else:
-            self.indices[idx] = OrderedHashtable.Node(self.count, self.indices[idx])
-            self.entries.append([key,val])
-            self.count += 1
+            self._add(loc, h, key, val)
     
     def __delitem__(self, key):
-        idx = hash(key) % len(self.indices)
-        node = self.indices[idx]
-        if self.entries[node.index][0] == key:
-            self.entries[node.index] = [None,None]
-            self.indices[idx] = node.next
-            self.count -= 1
-            return
-        while node.next:
-            if self.entries[node.next.index][0] == key:
-                self.entries[node.next.index] =  [None,None]
-                node.next = node.next.next
-                self.count -= 1
-            else:
-                node = node.next
-    
+        loc, ix = self._probe(key, hash(key))
+        if ix < 0:
+            raise KeyError(key)
+        self._remove(loc, ix)
         
     def __contains__(self, key):
-        try:
-            _ = self[key]
-            return True
-        except:
-            return False
+        return self._probe(key, hash(key))[1] >= 0
         
     def __len__(self):
         return self.count
     
     def __iter__(self):
         for x in self.entries:
-            if x[0] != None:
-                yield x[0]
+            if x is not None:
+                yield x.key
     def keys(self):
-        return iter(self)
+        return OrderedHashtable.Keys(self)
     
     def values(self):
-        for x in self.entries:
-            if x[0] != None:
-                yield x[1]
-                
-
-
+        return OrderedHashtable.Values(self)
                 
     def items(self):
-        for x in self.entries:
-            if x[0] != None:
-                yield x
+        return OrderedHashtable.Items(self)
+
+    def __reversed__(self):
+        for x in reversed(self.entries):
+            if x is not None:
+                yield x.key
+
+    _MISSING = object()
+
+    def get(self, key, default=None):
+        _, ix = self._probe(key, hash(key))
+        return default if ix < 0 else self.entries[ix].value
+
+    def setdefault(self, key, default=None):
+        h = hash(key)
+        loc, ix = self._probe(key, h)
+        if ix >= 0:
+            return self.entries[ix].value
+        self._add(loc, h, key, default)
+        return default
+
+    def pop(self, key, default=_MISSING):
+        loc, ix = self._probe(key, hash(key))
+        if ix < 0:
+            if default is OrderedHashtable._MISSING:
+                raise KeyError(key)
+            return default
+        val = self.entries[ix].value
+        self._remove(loc, ix)
+        return val
+
+    def popitem(self, last=True):
+        """Removes and returns the (key, value) pair that was added last (or
+        first, if last is False)."""
+        if not self.count:
+            raise KeyError('popitem(): hashtable is empty')
+        entries = self.entries
+        if last:
+            while entries[-1] is None: # no node refers to trailing tombstones
+                entries.pop()
+            ix = len(entries) - 1
+        else:
+            ix = self.start
+            while entries[ix] is None:
+                ix += 1
+            self.start = ix + 1
+        e = entries[ix]
+        loc, _ = self._probe(e.key, e.hash)
+        self._remove(loc, ix)
+        return (e.key, e.value)
+
+    def move_to_end(self, key, last=True):
+        """Moves key to the end of the ordering (or to the front, if last is
+        False, which takes O(n) time as all entries must be renumbered)."""
+        loc, ix = self._probe(key, hash(key))
+        if ix < 0:
+            raise KeyError(key)
+        e, self.entries[ix] = self.entries[ix], None
+        if last:
+            self.entries.append(e)
+            self._renumber(loc, len(self.entries) - 1)
+        else:
+            self.entries.insert(0, e)
+            self._shift_indices()
+            self._renumber(loc, 0)
+            self.start = 0
+        self._check_load()
+
+    def update(self, other=(), **kwds):
+        """Adds all the key/value pairs in other (a mapping, or an iterable
+        of pairs) and kwds, first growing the index to fit them all (if their
+        number is known)."""
+        if hasattr(other, '__len__') and other is not self:
+            self._reserve(self.count + len(other) + len(kwds))
+        if isinstance(other, Mapping):
+            other = other.items()
+        elif hasattr(other, 'keys'):
+            other = ((k, other[k]) for k in other.keys())
+        for k, v in other:
+            self[k] = v
+        for k, v in kwds.items():
+            self[k] = v
+
+    def clear(self):
+        self.indices = [None] * len(self.indices)
+        self.old_indices = None
+        self.entries = []
+        self.count = 0
+        self.start = 0
+
+    def _new_table(self):
+        """Returns a new, empty hashtable of the same kind and configuration
+        as this one."""
+        return OrderedHashtable(len(self.indices), self.max_load, self.min_load,
+                                self.incremental, self.max_tombstones)
+
+    def copy(self):
+        """Returns a shallow copy of this hashtable (with the same ordering)."""
+        rv = self._new_table()
+        rv.update(self)
+        return rv
+
+    @classmethod
+    def fromkeys(cls, iterable, value=None):
+        """Returns a new hashtable mapping each key in iterable to value."""
+        rv = cls()
+        if hasattr(iterable, '__len__'):
+            rv._reserve(len(iterable))
+        for k in iterable:
+            rv[k] = value
+        return rv
+
+    def __eq__(self, other):
+        """Like an OrderedDict, compares orderings with other ordered
+        hashtables and OrderedDicts, but not with other mappings."""
+        if isinstance(other, (OrderedHashtable, OrderedDict)):
+            return len(self) == len(other) and all(
+                k1 == k2 and v1 == v2 for (k1, v1), (k2, v2) in zip(self.items(), other.items()))
+        if isinstance(other, Mapping):
+            return len(self) == len(other) and all(
+                other.get(k, OrderedHashtable._MISSING) == v for k, v in self.items())
+        return NotImplemented
                 
     def __str__(self):
         return '{ ' + ', '.join(str(k) + ': ' + str(v) for k, v in self.items()) + ' }'
@@ -174,7 +479,7 @@ def ll_len(l):
         l = l.next
     return c
     
-ht = OrderedHashtable(10)
+ht = OrderedHashtable(10, max_load=None)
 for i in range(25):
     ht[MyInt(i)] = i*2
 
@@ -317,5 +622,532 @@ tc.assertLess(end-start, 1.5, 'Your implementation ran too slow!')
 # In[ ]:
 
 
+# test resizing
+
+from unittest import TestCase
+import random
+
+tc = TestCase()
+
+def max_chain(ht):
+    return max(ll_len(b) for b in ht.indices)
+
+ht = OrderedHashtable(4)
+for i in range(1000):
+    ht[MyInt(i)] = i
+    tc.assertLessEqual(len(ht), len(ht.indices))
+tc.assertEqual(1024, len(ht.indices))
+tc.assertEqual(8, ht.resizes)
+tc.assertEqual(1, max_chain(ht))
+for i in range(1000):
+    tc.assertEqual(i, ht[MyInt(i)])
+
+ht = OrderedHashtable(8, max_load=2.0, min_load=0.25)
+for i in range(1000):
+    ht[str(i)] = i
+tc.assertEqual(512, len(ht.indices))
+for i in range(990):
+    del ht[str(i)]
+tc.assertEqual(32, len(ht.indices))
+tc.assertEqual([str(i) for i in range(990, 1000)], list(ht))
+with tc.assertRaises(ValueError):
+    OrderedHashtable(8, max_load=1.0, min_load=0.5)
+
+# deleting missing keys, and re-inserting after deletes
+ht = OrderedHashtable(2)
+with tc.assertRaises(KeyError):
+    del ht['a']
+ht['a'], ht['b'], ht['c'] = 1, 2, 3
+del ht['a']
+with tc.assertRaises(KeyError):
+    del ht['a']
+ht['d'] = 4
+tc.assertEqual([('b', 2), ('c', 3), ('d', 4)], list(ht.items()))
+
+# incremental rehashing gives the same results, a few buckets at a time
+for incremental in (False, True):
+    ht = OrderedHashtable(8, min_load=0.25, incremental=incremental)
+    d, pending = {}, 0
+    for _ in range(20000):
+        k = str(random.randrange(2000))
+        if k in d and random.randrange(3) == 0:
+            del d[k]
+            del ht[k]
+        else:
+            d[k] = ht[k] = random.randrange(1000)
+        pending += ht.old_indices is not None
+    tc.assertEqual(incremental, pending > 0)
+    tc.assertEqual(len(d), len(ht))
+    tc.assertEqual(list(d.items()), list(ht.items()))
+    for k in d:
+        tc.assertEqual(d[k], ht[k])
+    tc.assertEqual(len(d), sum(ll_len(b) for b in ht.indices + (ht.old_indices or [])))
+
+# no need to pre-size the table: it doubles just as often as needed to keep
+# the load at most 1, and the chains stay short
+ht = OrderedHashtable()
+d = {}
+
+for _ in range(100000):
+    k, v = str(random.randrange(100000)), str(random.randrange(10000000, 99999999))
+    d[k] = v
+    ht[k] = v
+    
+for k,v in d.items():
+    tc.assertTrue(k in ht)
+    tc.assertEqual(d[k], ht[k])
+
+tc.assertLessEqual(len(ht), len(ht.indices))
+tc.assertLess(len(ht.indices) // 2, len(ht))
+tc.assertEqual(len(ht.indices), 1000 * 2 ** ht.resizes)
+tc.assertLess(max_chain(ht), 12)
+
+
+# ### `CompactOrderedHashtable`
+# 
+# An `OrderedHashtable` with the index layout used by CPython's `dict`: rather than chains of `Node` objects, `indices` is a compact `array` of entry numbers (using the smallest integer type that fits), searched by open addressing with perturbed probing. Slots are `EMPTY` if never used and `DUMMY` if their entry was deleted. As each entry caches the hash of its key, probes only compare keys whose hashes match, and resizing --- which also drops deleted entries --- never rehashes a key. This saves a heap-allocated node per key, and most lookups touch just one slot of a small array.
+
+# In[ ]:
+
+
+from array import array
+
+class CompactOrderedHashtable(OrderedHashtable):
+    EMPTY = -1
+    DUMMY = -2
+    PERTURB_SHIFT = 5
+
+    def __init__(self, n_buckets=8, max_load=2/3, min_load=None, max_tombstones=0.5):
+        """Creates a hashtable with (at least) n_buckets slots, rounded up to
+        a power of two. As an open-addressing table must keep some slots
+        empty, max_load must be less than 1; incremental rehashing isn't
+        supported."""
+        if max_load is None or not 0 < max_load < 1:
+            raise ValueError('max_load must be between 0 and 1')
+        super().__init__(0, max_load, min_load, max_tombstones=max_tombstones)
+        self.fill = 0    # number of slots that aren't EMPTY
+        self.indices = self._new_index(n_buckets)
+
+    def _new_index(self, n_buckets):
+        """Returns an index with (at least) n_buckets EMPTY slots."""
+        n = self.MIN_BUCKETS
+        while n < n_buckets:
+            n *= 2
+        for typecode in 'bhiq':
+            if n <= 1 << (8 * array(typecode).itemsize - 1):
+                break
+        return array(typecode, [self.EMPTY]) * n
+
+    def _probe(self, key, h):
+        """Returns the slot holding key (whose hash is h) along with the
+        number of its entry or, if key is absent, the first EMPTY slot on its
+        probe sequence along with EMPTY."""
+        indices, entries = self.indices, self.entries
+        mask = len(indices) - 1
+        perturb = h & 0xFFFFFFFFFFFFFFFF
+        i = perturb & mask
+        while True:
+            ix = indices[i]
+            if ix == self.EMPTY:
+                return i, ix
+            if ix >= 0:
+                e = entries[ix]
+                if e.hash == h and (e.key is key or e.key == key):
+                    return i, ix
+            perturb >>= self.PERTURB_SHIFT
+            i = (i * 5 + perturb + 1) & mask
+
+    def _rebuild(self, n_buckets):
+        """Drops deleted entries, and rebuilds the index (using the cached
+        hashes) with n_buckets slots."""
+        self.entries = [e for e in self.entries if e is not None]
+        self.indices = indices = self._new_index(n_buckets)
+        mask = len(indices) - 1
+        for ix, e in enumerate(self.entries):
+            perturb = e.hash & 0xFFFFFFFFFFFFFFFF
+            i = perturb & mask
+            while indices[i] != self.EMPTY:
+                perturb >>= self.PERTURB_SHIFT
+                i = (i * 5 + perturb + 1) & mask
+            indices[i] = ix
+        self.fill = len(self.entries)
+        self.start = 0
+
+    def _resize(self, n_buckets):
+        self._rebuild(n_buckets)
+        self.resizes += 1
+
+    def compact(self):
+        """Drops the deleted entries from `entries`, by rebuilding the index
+        at its current size (which also clears out its DUMMY slots)."""
+        self._rebuild(len(self.indices))
+        self.compactions += 1
+
+    def _check_load(self):
+        """Rebuilds the index once too few slots are EMPTY, or (if min_load
+        is set) too few hold keys, sizing it so that half of max_load is
+        used. Otherwise, compacts it if there are too many deleted entries."""
+        n = len(self.indices)
+        # entries moved to the end are renumbered in place, so the number of
+        # entries can exceed fill, but must also fit in the index's typecode
+        if (max(self.fill, len(self.entries)) > self.max_load * n or
+            self.min_load is not None and n > self.MIN_BUCKETS and self.count < self.min_load * n):
+            self._resize(2 * self.count / self.max_load)
+        elif self._too_many_tombstones():
+            self.compact()
+
+    ### index primitives ###
+
+    def _add(self, loc, h, key, val):
+        self.indices[loc] = len(self.entries)
+        self.entries.append(OrderedHashtable.Entry(h, key, val))
+        self.count += 1
+        self.fill += 1
+        self._check_load()
+
+    def _remove(self, loc, ix):
+        self.indices[loc] = self.DUMMY
+        self.entries[ix] = None
+        self.count -= 1
+        self._check_load()
+
+    def _renumber(self, loc, ix):
+        self.indices[loc] = ix
+
+    def _shift_indices(self):
+        indices = self.indices
+        for i, ix in enumerate(indices):
+            if ix >= 0:
+                indices[i] = ix + 1
+
+    def _reserve(self, n):
+        if n > self.max_load * len(self.indices):
+            self._resize(n / self.max_load)
+
+    def clear(self):
+        super().clear()
+        self.indices = self._new_index(len(self.indices))
+        self.fill = 0
+
+    def _new_table(self):
+        return CompactOrderedHashtable(len(self.indices), self.max_load, self.min_load,
+                                       self.max_tombstones)
+
+
+# In[ ]:
+
+
+# test compact hashtables
+
+from unittest import TestCase
+import random
+
+tc = TestCase()
+
+ht = CompactOrderedHashtable()
+for k, v in (('batman', 'bruce wayne'), ('superman', 'clark kent'), ('spiderman', 'peter parker')):
+    ht[k] = v
+tc.assertEqual(3, len(ht))
+tc.assertEqual('clark kent', ht['superman'])
+tc.assertTrue('spiderman' in ht)
+tc.assertFalse('iron man' in ht)
+with tc.assertRaises(KeyError):
+    ht['iron man']
+with tc.assertRaises(KeyError):
+    del ht['iron man']
+with tc.assertRaises(ValueError):
+    CompactOrderedHashtable(max_load=1.0)
+
+# colliding and negative hashes
+ht = CompactOrderedHashtable(1000)
+tc.assertEqual(1024, len(ht.indices))
+tc.assertEqual('h', ht.indices.typecode)
+keys = [MyInt(i * 1024) for i in range(-50, 50)]
+for k in keys:
+    ht[k] = -k
+for k in keys[::2]:
+    del ht[k]
+tc.assertEqual(keys[1::2], list(ht))
+for k in keys[1::2]:
+    tc.assertEqual(-k, ht[k])
+for k in keys[::2]:
+    tc.assertFalse(k in ht)
+
+for min_load in (None, 0.1):
+    ht = CompactOrderedHashtable(min_load=min_load)
+    d = {}
+    for _ in range(20000):
+        k = str(random.randrange(2000))
+        if k in d and random.randrange(3) == 0:
+            del d[k]
+            del ht[k]
+        else:
+            d[k] = ht[k] = random.randrange(1000)
+        tc.assertLess(ht.fill, len(ht.indices))
+    tc.assertEqual(len(d), len(ht))
+    tc.assertEqual(list(d.items()), list(ht.items()))
+    for k in d:
+        tc.assertEqual(d[k], ht[k])
+    tc.assertEqual(ht.fill, len(ht.entries))
+    tc.assertEqual(len(ht), sum(ix >= 0 for ix in ht.indices))
+    for k in list(d)[:-10]:
+        del d[k]
+        del ht[k]
+    tc.assertEqual(list(d.items()), list(ht.items()))
+    tc.assertEqual(min_load is None, len(ht.indices) > CompactOrderedHashtable.MIN_BUCKETS * 8)
+
+# growing from the minimum size, each resize at least quadruples the index
+# (to ~3x the number of keys), so the index needs only a few of them
+ht = CompactOrderedHashtable()
+d = {}
+
+for _ in range(100000):
+    k, v = str(random.randrange(100000)), str(random.randrange(10000000, 99999999))
+    d[k] = v
+    ht[k] = v
+    
+for k,v in d.items():
+    tc.assertTrue(k in ht)
+    tc.assertEqual(d[k], ht[k])
+
+tc.assertEqual(len(ht), ht.fill)
+tc.assertLessEqual(ht.fill, ht.max_load * len(ht.indices))
+tc.assertLessEqual(ht.resizes, 8)
+tc.assertEqual('i', ht.indices.typecode)
+
+
+# In[ ]:
+
+
+# test cached hashes
+
+from unittest import TestCase
+
+tc = TestCase()
+
+class CountedKey:
+    """A key that counts the calls to its __hash__ and __eq__ methods, and
+    whose hash is its value modulo 10 (so that keys often collide)."""
+    hashes = eqs = 0
+
+    def __init__(self, val):
+        self.val = val
+
+    def __hash__(self):
+        CountedKey.hashes += 1
+        return self.val % 10
+
+    def __eq__(self, other):
+        CountedKey.eqs += 1
+        return self.val == other.val
+
+for make in (lambda: OrderedHashtable(2, incremental=True), OrderedHashtable, CompactOrderedHashtable):
+    ht = make()
+    keys = [CountedKey(i) for i in range(100)]
+    CountedKey.hashes = CountedKey.eqs = 0
+    for k in keys:
+        ht[k] = k.val
+    for k in keys:
+        tc.assertEqual(k.val, ht[k])
+    # each operation hashes its key just once (so resizing never does), and
+    # only compares it with keys that have the same hash: at most 45 other
+    # keys per operation, in each group of 10 keys with the same hash
+    tc.assertEqual(200, CountedKey.hashes)
+    tc.assertLessEqual(CountedKey.eqs, 2 * 450)
+    tc.assertEqual(50, ht[CountedKey(50)])
+    tc.assertEqual(list(range(100)), list(ht.values()))
+
+    # keys whose hashes differ are never compared, even if in the same bucket
+    ht = make()
+    CountedKey.eqs = 0
+    for i in range(10):
+        ht[CountedKey(i)] = i
+    for i in range(10):
+        tc.assertEqual(i, ht[CountedKey(i)])
+        del ht[CountedKey(i)]
+    tc.assertEqual(20, CountedKey.eqs)
+
+
+# In[ ]:
+
+
+# test compaction
+
+from unittest import TestCase
+import random
+
+tc = TestCase()
+
+for make in (OrderedHashtable, lambda: OrderedHashtable(8, incremental=True), CompactOrderedHashtable):
+    ht = make()
+    d = {}
+    for i in range(20000):
+        k = str(random.randrange(1000))
+        if k in d:
+            del d[k]
+            del ht[k]
+        d[k] = ht[k] = i
+        if random.randrange(3) == 0:
+            k = next(iter(d))
+            del d[k]
+            del ht[k]
+        tc.assertLessEqual(len(ht.entries), max(2 * len(ht), len(ht) + ht.MIN_BUCKETS) + 1)
+    tc.assertGreater(ht.compactions, 0)
+    tc.assertEqual(list(d.items()), list(ht.items()))
+    for k in d:
+        tc.assertEqual(d[k], ht[k])
+
+    # manual compaction
+    for k in list(d)[::2]:
+        del d[k]
+        del ht[k]
+    ht.compact()
+    tc.assertEqual(len(ht), len(ht.entries))
+    tc.assertEqual(list(d.items()), list(ht.items()))
+    for k in d:
+        tc.assertEqual(d[k], ht[k])
+
+# compacting during an incremental rehash finishes it first
+ht = OrderedHashtable(8, incremental=True)
+for i in range(9):
+    ht[i] = i
+tc.assertIsNotNone(ht.old_indices)
+for i in range(0, 9, 2):
+    del ht[i]
+ht.compact()
+tc.assertIsNone(ht.old_indices)
+tc.assertEqual([1, 3, 5, 7], list(ht))
+indices = []
+for node in ht.indices:
+    while node:
+        indices.append(node.index)
+        node = node.next
+tc.assertEqual([0, 1, 2, 3], sorted(indices))
+tc.assertEqual([1, 3, 5, 7], [ht[k] for k in (1, 3, 5, 7)])
+
+# can be disabled
+ht = OrderedHashtable(max_tombstones=None)
+for i in range(1000):
+    ht[i] = i
+    del ht[i]
+tc.assertEqual(1000, len(ht.entries))
+tc.assertEqual([], list(ht))
+
+
+# In[ ]:
+
+
+# test dict API
+
+from unittest import TestCase
+from collections import OrderedDict
+from collections.abc import MutableMapping
+import random
+
+tc = TestCase()
+
+for make in (OrderedHashtable, lambda: OrderedHashtable(8, incremental=True), CompactOrderedHashtable):
+    ht, od = make(), OrderedDict()
+    tc.assertIsInstance(ht, MutableMapping)
+    for _ in range(20000):
+        k, v = str(random.randrange(500)), random.randrange(1000)
+        op = random.randrange(9)
+        if op == 0:
+            tc.assertEqual(od.get(k), ht.get(k))
+            tc.assertEqual(od.get(k, 'x'), ht.get(k, 'x'))
+        elif op == 1:
+            tc.assertEqual(od.setdefault(k, v), ht.setdefault(k, v))
+        elif op == 2:
+            tc.assertEqual(od.pop(k, None), ht.pop(k, None))
+        elif op == 3 and od:
+            last = random.randrange(2) == 0
+            tc.assertEqual(od.popitem(last), ht.popitem(last))
+        elif op == 4 and k in od:
+            last = random.randrange(4) != 0
+            od.move_to_end(k, last)
+            ht.move_to_end(k, last)
+        else:
+            od[k] = ht[k] = v
+        tc.assertEqual(k in od, k in ht)
+        tc.assertEqual(len(od), len(ht))
+    tc.assertEqual(list(od.items()), list(ht.items()))
+    tc.assertEqual(list(reversed(od)), list(reversed(ht)))
+    tc.assertEqual(od, ht)
+    tc.assertEqual(ht, od)
+    tc.assertEqual(dict(od), ht)
+    if od:
+        od.move_to_end(next(iter(od)))
+        tc.assertNotEqual(od, ht)
+        tc.assertEqual(dict(od), ht)
+    for k in od:
+        tc.assertEqual(od[k], ht[k])
+
+    with tc.assertRaises(KeyError):
+        ht.pop('missing')
+    with tc.assertRaises(KeyError):
+        ht.move_to_end('missing')
+    ht.clear()
+    tc.assertEqual(0, len(ht))
+    tc.assertEqual([], list(ht))
+    with tc.assertRaises(KeyError):
+        ht.popitem()
+    ht['a'] = 1
+    tc.assertEqual([('a', 1)], list(ht.items()))
+
+    # update accepts mappings, pairs and keywords, and grows the index once
+    ht = make()
+    ht.update({str(i): i for i in range(5000)})
+    tc.assertLessEqual(ht.resizes, 1)
+    ht.update([('a', 1), ('b', 2)], c=3)
+    n_buckets = len(ht.indices)
+    ht.update(ht)
+    tc.assertEqual(n_buckets, len(ht.indices))
+    tc.assertEqual(list(range(5000)) + [1, 2, 3], list(ht.values()))
+
+    # views
+    ht = make()
+    ht.update(a=1, b=2, c=3)
+    keys, values, items = ht.keys(), ht.values(), ht.items()
+    tc.assertEqual(3, len(keys))
+    tc.assertEqual({'a', 'b', 'c'}, keys)
+    tc.assertEqual({('a', 1), ('b', 2), ('c', 3)}, items)
+    tc.assertTrue(('b', 2) in items)
+    tc.assertFalse(('b', 3) in items)
+    tc.assertTrue(2 in values)
+    tc.assertEqual({'b', 'c'}, keys - {'a'})
+    del ht['b']
+    ht['d'] = 4
+    tc.assertEqual(['a', 'c', 'd'], list(keys))
+    tc.assertEqual([4, 3, 1], list(reversed(values)))
+    tc.assertEqual([('d', 4), ('c', 3), ('a', 1)], list(reversed(items)))
+    tc.assertEqual(['d', 'c', 'a'], list(reversed(keys)))
+
+    # copy and fromkeys
+    ht2 = ht.copy()
+    tc.assertIs(type(ht), type(ht2))
+    tc.assertEqual(ht, ht2)
+    ht2['e'] = 5
+    tc.assertEqual(['a', 'c', 'd'], list(ht))
+    tc.assertEqual(['a', 'c', 'd', 'e'], list(ht2))
+    ht = type(ht).fromkeys('xyzx', 0)
+    tc.assertEqual([('x', 0), ('y', 0), ('z', 0)], list(ht.items()))
+
+# each operation hashes its key just once
+ht = OrderedHashtable()
+CountedKey.hashes = 0
+k = CountedKey(1)
+ht.setdefault(k, 1)
+ht.get(k)
+k in ht
+ht.pop(k)
+ht[k] = 1
+ht.move_to_end(k)
+ht.popitem()
+tc.assertEqual(6, CountedKey.hashes)
+
+
+# In[ ]:
+
+
 
 
@@ -117,8 +117,132 @@ class ConstrainedList (list):
 
 
 class ArrayList:
+    class Sharing:
+        """Counts the lists and views that share a single backing store."""
+        __slots__ = ('count',)
+
+        def __init__(self):
+            self.count = 1
+
+    MIN_CAPACITY = 4
+    _shared = None # a Sharing, while the store is shared with copies/views
+
     def __init__(self):
-        self.data = ConstrainedList() # don't change this line!
+        self.resizes = 0
+        self.data = self._new_store()
+
+    def _new_store(self):
+        """Returns a new, empty backing store."""
+        return ConstrainedList() # don't change this line!
+
+    @property
+    def data(self):
+        """The backing store. Only the first `len(self)` slots hold elements;
+        the rest is spare capacity. Assigning a new store adopts all of its
+        slots as elements. (Methods read `_data` directly, skipping the
+        property call in their loops.)"""
+        return self._data
+
+    @data.setter
+    def data(self, store):
+        self._release()
+        self._data = store
+        self.length = len(store)
+
+
+    ### copy-on-write ###
+
+    def _share(self):
+        """Registers one more holder of this list's store, and returns its
+        Sharing counter."""
+        if self._shared is None:
+            self._shared = ArrayList.Sharing()
+        self._shared.count += 1
+        return self._shared
+
+    def _release(self):
+        """Stops sharing this list's store with other holders."""
+        if self._shared is not None:
+            self._shared.count -= 1
+            self._shared = None
+
+    def _copy_store(self):
+        """Returns a copy of the backing store (including spare capacity)."""
+        store = self._new_store()
+        for i in range(len(self._data)):
+            store.append(None)
+        for i in range(self.length):
+            store[i] = self._data[i]
+        return store
+
+    def _own(self):
+        """Called before this list modifies its store: if the store is still
+        shared with copies or views, switches to a private copy first."""
+        if self._shared.count > 1:
+            store = self._copy_store()
+            self._release()
+            self._data = store
+        else:
+            self._shared = None
+
+    def __del__(self):
+        self._release()
+
+    def view(self, start=0, stop=None):
+        """Returns a read-only view of the elements between indexes start
+        (inclusive) and stop (exclusive), without copying them. The view
+        shares this list's store and keeps showing the elements as they
+        were when it was created, even if the list is later modified."""
+        return ArrayList.View(self, *slice(start, stop).indices(self.length)[:2])
+
+
+    ### capacity management ###
+
+    @property
+    def capacity(self):
+        """The number of slots currently allocated in the backing store."""
+        return len(self._data)
+
+    def _new_list(self):
+        """Returns a new, empty list of the same kind as this one."""
+        return ArrayList()
+
+    def _resize(self, capacity):
+        """Grows or shrinks the backing store to exactly `capacity` slots
+        (which must not be fewer than the number of elements)."""
+        while len(self._data) < capacity:
+            self._data.append(None)
+        while len(self._data) > capacity:
+            del self._data[len(self._data)-1]
+        self.resizes += 1
+
+    def _grow(self, n):
+        """Ensures there is room for `n` elements, at least doubling the
+        capacity when the store has to grow, so appends are amortized O(1)."""
+        if n > len(self._data):
+            self._resize(max(n, 2 * len(self._data), ArrayList.MIN_CAPACITY))
+
+    def _shrink(self):
+        """Shrinks the store to twice the number of elements once occupancy has
+        dropped to a quarter. The gap between the grow and shrink thresholds
+        keeps alternating appends and pops from resizing the store every time."""
+        if len(self._data) > ArrayList.MIN_CAPACITY and self.length <= len(self._data) // 4:
+            self._resize(max(2 * self.length, ArrayList.MIN_CAPACITY))
+
+    def reserve(self, n):
+        """Grows the capacity to at least `n` slots, so the next `n - len(self)`
+        appends will not resize the store."""
+        if self._shared is not None:
+            self._own()
+        if n > len(self._data):
+            self._resize(n)
+
+    def shrink_to_fit(self):
+        """Releases all spare capacity."""
+        if self._shared is not None:
+            self._own()
+        if len(self._data) > self.length:
+            self._resize(self.length)
 
     
     ### subscript-based access ###
@@ -126,61 +250,166 @@ class ArrayList:
     def _normalize_idx(self, idx):
         nidx = idx
         if nidx < 0:
-            nidx += len(self.data)
+            nidx += self.length
             if nidx < 0:
                 nidx = 0
         return nidx
+
+    def _slice_range(self, slc):
+        """Returns the (ascending) range of indexes selected by slice `slc`."""
+        r = range(*slc.indices(self.length))
+        return r if r.step > 0 else r[::-1]
+
+    def _move(self, src, dst, n):
+        """Moves the block of `n` slots starting at `src` so that it starts at
+        `dst`, in a single pass. Overlapping blocks are handled by copying
+        in the direction that never overwrites unread slots."""
+        if dst < src:
+            for i in range(n):
+                self._data[dst+i] = self._data[src+i]
+        elif dst > src:
+            for i in range(n-1, -1, -1):
+                self._data[dst+i] = self._data[src+i]
+
+    def _clear(self, start, stop):
+        """Resets vacated slots so the store doesn't keep removed values alive."""
+        for i in range(start, stop):
+            self._data[i] = None
+
+    def _open_gap(self, idx, k):
+        """Makes room for `k` elements at `idx` by shifting the tail of the
+        list down `k` slots at once. The gap holds stale values."""
+        self._grow(self.length + k)
+        self._move(idx, idx + k, self.length - idx)
+        self.length += k
+
+    def _close_gap(self, idx, k):
+        """Removes the `k` elements starting at `idx` by shifting the tail of
+        the list up `k` slots at once."""
+        self._move(idx + k, idx, self.length - idx - k)
+        self._clear(self.length - k, self.length)
+        self.length -= k
+        self._shrink()
     
     def __getitem__(self, idx):
-        """Implements `x = self[idx]`"""
+        """Implements `x = self[idx]` and `x = self[start:stop:step]`"""
+        if isinstance(idx, slice):
+            r = range(*idx.indices(self.length))
+            new_list = self._new_list()
+            new_list.reserve(len(r))
+            for i in r:
+                new_list.append(self._data[i])
+            return new_list
         assert(isinstance(idx, int))
         nidx = self._normalize_idx(idx)
-        if nidx >= len(self.data):
+        if nidx >= self.length:
             raise IndexError
-        return self.data[nidx]
+        return self._data[nidx]
 
     def __setitem__(self, idx, value):
-        """Implements `self[idx] = x`"""
+        """Implements `self[idx] = x` and `self[start:stop:step] = iterable`.
+        Assigning to a simple slice may change the length of the list; an
+        extended slice must be assigned exactly as many values as it selects."""
+        if self._shared is not None:
+            self._own()
+        if isinstance(idx, slice):
+            self._set_slice(idx, value)
+            return
         assert(isinstance(idx, int))
         nidx = self._normalize_idx(idx)
-        if nidx >= len(self.data):
+        if nidx >= self.length:
             raise IndexError
-        self.data[nidx] = value
+        self._data[nidx] = value
+
+    def _sized(self, values):
+        """Returns values as an indexable sequence of known length, so bulk
+        operations can pre-size the store. Only sequences known to support
+        O(1) positional indexing are used as is; all other iterables (e.g.,
+        mappings, which are indexed by key, or linked lists, which are indexed
+        by walking) --- and this list itself, which the operation is about to
+        modify --- are copied first."""
+        if values is self or not isinstance(values, (list, tuple, range, str, ArrayList, ArrayList.View)):
+            values = tuple(values)
+        return values
+
+    def _set_slice(self, slc, values):
+        values = self._sized(values)
+        start, stop, step = slc.indices(self.length)
+        if step == 1:
+            stop = max(start, stop)
+            k = len(values)
+            if k > stop - start:
+                self._open_gap(stop, k - (stop - start))
+            elif k < stop - start:
+                self._close_gap(start + k, (stop - start) - k)
+            for i in range(k):
+                self._data[start+i] = values[i]
+        else:
+            r = range(start, stop, step)
+            if len(values) != len(r):
+                raise ValueError('attempt to assign sequence of size {} to extended slice of size {}'
+                                 .format(len(values), len(r)))
+            for i in range(len(r)):
+                self._data[r[i]] = values[i]
 
     def __delitem__(self, idx):
-        """Implements `del self[idx]`"""
+        """Implements `del self[idx]` and `del self[start:stop:step]`"""
+        if self._shared is not None:
+            self._own()
+        if isinstance(idx, slice):
+            self._del_slice(idx)
+            return
         assert(isinstance(idx, int))
         nidx = self._normalize_idx(idx)
-        if nidx >= len(self.data):
+        if nidx >= self.length:
             raise IndexError
-        for i in range(nidx+1, len(self.data)):
-            self.data[i-1] = self.data[i]
-        del self.data[len(self.data)-1]
+        self._close_gap(nidx, 1)
+
+    def _del_slice(self, slc):
+        r = self._slice_range(slc)
+        if len(r) == 0:
+            return
+        if r.step == 1:
+            self._close_gap(r.start, len(r))
+            return
+        # compact the survivors towards the front in one pass
+        dst = r.start
+        for src in range(r.start, self.length):
+            if src not in r:
+                self._data[dst] = self._data[src]
+                dst += 1
+        self._clear(dst, self.length)
+        self.length = dst
+        self._shrink()
     
 
     ### stringification ###
+
+    repr_limit = 100
     
+    def _render(self, limit=None):
+        """Renders the first `limit` elements (or all of them, if `limit` is
+        None) with a single join, summarizing any that were left out."""
+        n = self.length if limit is None else min(limit, self.length)
+        shown = ', '.join(str(self._data[i]) for i in range(n))
+        if n == self.length:
+            return '[' + shown + ']'
+        more = '... {} more]'.format(self.length - n)
+        return '[' + shown + ', ' + more if n else '[' + more
+
     def __str__(self):
         """Implements `str(self)`. Returns '[]' if the list is empty, else
         returns `str(x)` for all values `x` in this list, separated by commas
         and enclosed by square brackets. E.g., for a list containing values
         1, 2 and 3, returns '[1, 2, 3]'."""
-        # YOUR CODE HERE
-        string = ''
-        if len(self.data) is 0:
-            return '[]'
-        else:
-            for i in range(len(self.data)):
-                string += str(self.data[i])
-                if i is not len(self.data) - 1:
-                    string += ', '
-        return '[' + string + ']'
-       
+        return self._render()
         
     def __repr__(self):
-        """Supports REPL inspection. (Same behavior as `str`.)"""
-        # YOUR CODE HERE
-        return self.__str__()
+        """Supports REPL inspection. (Same behavior as `str`, except that only
+        the first `repr_limit` elements are shown, e.g. '[1, 2, 3, ... 997 more]'
+        for a 1000-element list with `repr_limit` 3. A `repr_limit` of None
+        shows all elements.)"""
+        return self._render(self.repr_limit)
 
 
     ### single-element manipulation ###
@@ -188,8 +417,11 @@ class ArrayList:
     def append(self, value):
         """Appends value to the end of this list."""
         # YOUR CODE HERE
-        self.data.append(None)
-        self.data[len(self.data) - 1] = value
+        if self._shared is not None:
+            self._own()
+        self._grow(self.length + 1)
+        self._data[self.length] = value
+        self.length += 1
 
     
     def insert(self, idx, value):
@@ -197,18 +429,31 @@ class ArrayList:
         list, as needed. Note that inserting a value at len(self) --- equivalent
         to appending the value --- is permitted. Raises IndexError if idx is invalid."""
         # YOUR CODE HERE
-        if (idx > len(self.data)):
+        if self._shared is not None:
+            self._own()
+        if (idx > self.length):
             raise IndexError
         elif idx <0 :
             raise IndexError
-        elif(idx == len(self.data)) :
+        elif(idx == self.length) :
             self.append(value)
         else:
-            self.data.append(None)
-            for i in range(len(self.data)-1, idx, -1):
-                self.data[i]= self.data[i-1]
-                self.data[i-1]= None
-            self.__setitem__(idx, value)
+            self._open_gap(idx, 1)
+            self._data[idx] = value
+
+    def insert_many(self, idx, values):
+        """Inserts all elements, in order, from values --- an Iterable --- at
+        position idx. The storage is resized at most once and the original
+        elements are shifted down the list exactly once. Raises IndexError if
+        idx is invalid."""
+        if self._shared is not None:
+            self._own()
+        if idx > self.length or idx < 0:
+            raise IndexError
+        values = self._sized(values)
+        self._open_gap(idx, len(values))
+        for i in range(len(values)):
+            self._data[idx+i] = values[i]
             
   
     def pop(self, idx=-1):
@@ -223,12 +468,11 @@ class ArrayList:
         """Removes the first (closest to the front) instance of value from the
         list. Raises a ValueError if value is not found in the list."""
         # YOUR CODE HERE
-        for i in range(len(self.data)):
-            if self.data[i] == value:
+        for i in range(self.length):
+            if self._data[i] == value:
                 self.pop(i)
-                break
-            elif i == len(self.data) - 1:
-                raise ValueError
+                return
+        raise ValueError
     
 
     ### predicates (T/F queries) ###
@@ -238,13 +482,13 @@ class ArrayList:
         other. If other is not an ArrayList, returns False."""
         # YOUR CODE HERE
         count = 0
-        if (len(self.data) != len(other)):
+        if (self.length != len(other)):
             return False
         else:
-            for i in range(len(self.data)):
-                if self.data[i] == other[i]:
+            for i in range(self.length):
+                if self._data[i] == other[i]:
                     count += 1
-            if count == len(self.data):
+            if count == self.length:
                 return True
             else:
                 return False
@@ -253,8 +497,8 @@ class ArrayList:
     def __contains__(self, value):
         """Implements `val in self`. Returns true if value is found in this list."""
         # YOUR CODE HERE
-        for i in range(len(self.data)):
-            if value == self.data[i]:
+        for i in range(self.length):
+            if value == self._data[i]:
                 return True
         return False
 
@@ -264,24 +508,28 @@ class ArrayList:
     def __len__(self):
         """Implements `len(self)`"""
         # YOUR CODE HERE
-        return len(self.data)
+        return self.length
     
     def min(self):
         """Returns the minimum value in this list."""
         # YOUR CODE HERE
-        min_idx = self.data[0]
-        for i in range(1, len(self.data)):
-            if self.data[i] < min_idx:
-                min_idx = self.data[i]
+        if self.length == 0:
+            raise ValueError('min() of empty list')
+        min_idx = self._data[0]
+        for i in range(1, self.length):
+            if self._data[i] < min_idx:
+                min_idx = self._data[i]
         return min_idx
     
     def max(self):
         """Returns the maximum value in this list."""
         # YOUR CODE HERE
-        max_idx = self.data[0]
-        for i in range(1, len(self.data)):
-            if self.data[i] > max_idx:
-                max_idx = self.data[i]
+        if self.length == 0:
+            raise ValueError('max() of empty list')
+        max_idx = self._data[0]
+        for i in range(1, self.length):
+            if self._data[i] > max_idx:
+                max_idx = self._data[i]
         return max_idx
    
     def index(self, value, i=0, j=None):
@@ -290,25 +538,74 @@ class ArrayList:
         specified, search through the end of the list for value. If value
         is not in the list, raise a ValueError."""
         # YOUR CODE HERE
-        boolean = False
         if j == None:
-            j = len(self.data)
-        j = self._normalize_idx(j)
+            j = self.length
+        i = self._normalize_idx(i)
+        j = min(self._normalize_idx(j), self.length)
         for x in range(i, j):
-            if self.data[x] == value:
-                boolean = True
+            if self._data[x] == value:
                 return x
-        if boolean == False:
-            raise ValueError()
+        raise ValueError()
     
     def count(self, value):
         """Returns the number of times value appears in this list."""
         # YOUR CODE HERE
         count = 0
-        for i in range(len(self.data)):
-            if value == self.data[i]:
+        for i in range(self.length):
+            if value == self._data[i]:
                 count += 1
         return count
+
+    AGGREGATES = ('min', 'max', 'sum', 'argmin', 'argmax', 'count')
+    _NO_VALUE = object()
+
+    def aggregate(self, *ops, key=None, value=_NO_VALUE):
+        """Computes the named aggregates (any of 'min', 'max', 'sum', 'argmin',
+        'argmax' and 'count') in a single pass over this list, and returns
+        them as a tuple in the order requested. Elements are compared (and
+        summed) by `key(x)` if key is given; 'min' and 'max' are elements,
+        'argmin' and 'argmax' the indexes of their first occurrences, and
+        'count' the number of elements equal to value. Raises a ValueError
+        for unknown aggregates, or for 'min', 'max', 'argmin' and 'argmax' of
+        an empty list."""
+        for op in ops:
+            if op not in ArrayList.AGGREGATES:
+                raise ValueError('unknown aggregate: ' + repr(op))
+        want_min = 'min' in ops or 'argmin' in ops
+        want_max = 'max' in ops or 'argmax' in ops
+        want_sum = 'sum' in ops
+        want_count = 'count' in ops
+        if want_count and value is ArrayList._NO_VALUE:
+            raise ValueError("'count' requires a value")
+        if (want_min or want_max) and self.length == 0:
+            raise ValueError('aggregate of empty list')
+        argmin = argmax = 0
+        total = count = 0
+        if self.length:
+            min_k = max_k = self._data[0] if key is None else key(self._data[0])
+        for i in range(self.length):
+            x = self._data[i]
+            k = x if key is None else key(x)
+            if want_min and k < min_k:
+                min_k, argmin = k, i
+            if want_max and k > max_k:
+                max_k, argmax = k, i
+            if want_sum:
+                total += k
+            if want_count and x == value:
+                count += 1
+        results = {'sum': total, 'count': count, 'argmin': argmin, 'argmax': argmax}
+        if want_min:
+            results['min'] = self._data[argmin]
+        if want_max:
+            results['max'] = self._data[argmax]
+        return tuple(results[op] for op in ops)
+
+    def stats(self, key=None):
+        """Returns a dict with the 'min', 'max', 'sum', 'argmin' and 'argmax'
+        of this list, computed in a single pass (see `aggregate`)."""
+        ops = ('min', 'max', 'sum', 'argmin', 'argmax')
+        return dict(zip(ops, self.aggregate(*ops, key=key)))
     
     ### bulk operations ###
 
@@ -317,40 +614,159 @@ class ArrayList:
         instance that contains the values in this list followed by those 
         of other."""
         # YOUR CODE HERE
-        new_list = ArrayList()
-        for i in range(len(self.data)):
-            new_list.append(self.data[i])
-        for i in range(len(other)):
-            new_list.append(other[i])
-
+        new_list = self._new_list()
+        new_list.reserve(self.length + len(other))
+        new_list.extend(self)
+        new_list.extend(other)
         return new_list
     
     def clear(self):
-        self.data = ConstrainedList() # don't change this!
+        self.data = self._new_store()
         
     def copy(self):
-        """Returns a new ArrayList instance (with a separate data store), that
-        contains the same values as this list."""
+        """Returns a new ArrayList instance that contains the same values as
+        this list. The copy shares this list's data store until either of them
+        is modified, at which point the modified list gets a store of its own."""
         # YOUR CODE HERE
-        copy_list = ArrayList()
-        for i in range(len(self.data)):
-            copy_list.append(self.data[i])
+        copy_list = self._new_list()
+        copy_list._shared = self._share()
+        copy_list._data = self._data
+        copy_list.length = self.length
         return copy_list
 
     def extend(self, other):
         """Adds all elements, in order, from other --- an Iterable --- to this list."""
         # YOUR CODE HERE
-        for i in range(len(other)):
-            self.append(other[i])
+        self.insert_many(self.length, other)
         return self
             
+    ### ordering ###
+
+    def sort(self, key=None, reverse=False):
+        """Sorts this list in place, in ascending order of `key(x)` (or `x`,
+        if no key is given), or in descending order if `reverse` is True.
+        The sort is a stable, bottom-up merge sort: elements that compare
+        equal keep their original relative order. Each pass merges runs from
+        the store into a single scratch store of the same kind (so a typed
+        store stays unboxed), and the two then swap roles; keys are computed
+        once, into a parallel buffer, only if a key function is given."""
+        if self._shared is not None:
+            self._own()
+        n = self.length
+        src, dst = self._data, self._copy_store()
+        if key is None:
+            keys = keys2 = None
+        else:
+            keys, keys2 = [key(src[i]) for i in range(n)], [None] * n
+        width = 1
+        while width < n:
+            ks = src if keys is None else keys
+            for lo in range(0, n, 2 * width):
+                mid, hi = min(lo + width, n), min(lo + 2 * width, n)
+                i, j = lo, mid
+                for k in range(lo, hi):
+                    if j < hi and (i == mid or (ks[i] < ks[j] if reverse else ks[j] < ks[i])):
+                        dst[k] = src[j]
+                        if keys is not None:
+                            keys2[k] = keys[j]
+                        j += 1
+                    else:
+                        dst[k] = src[i]
+                        if keys is not None:
+                            keys2[k] = keys[i]
+                        i += 1
+            src, dst = dst, src
+            if keys is not None:
+                keys, keys2 = keys2, keys
+            width *= 2
+        if src is not self._data:
+            self._data = src # the scratch store has the same capacity
+
+    def bisect_left(self, value, lo=0, hi=None, key=None):
+        """Returns the leftmost position at which `value` could be inserted
+        into this (sorted) list, between lo and hi, keeping it sorted. If key
+        is given, it is applied to the elements of the list (but not to
+        value) before comparing."""
+        if hi is None:
+            hi = self.length
+        while lo < hi:
+            mid = (lo + hi) // 2
+            x = self._data[mid]
+            if (x if key is None else key(x)) < value:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def bisect_right(self, value, lo=0, hi=None, key=None):
+        """Like `bisect_left`, but returns the position after any elements
+        equal to value."""
+        if hi is None:
+            hi = self.length
+        while lo < hi:
+            mid = (lo + hi) // 2
+            x = self._data[mid]
+            if value < (x if key is None else key(x)):
+                hi = mid
+            else:
+                lo = mid + 1
+        return lo
+
+    def insort(self, value, key=None):
+        """Inserts value into this (sorted) list, after any elements equal to
+        it, keeping the list sorted."""
+        self.insert(self.bisect_right(value if key is None else key(value), key=key), value)
+
     ### iteration ###
     
     def __iter__(self):
         """Supports iteration (via `iter(self)`)"""
         # YOUR CODE HERE
-        for i in range(len(self.data)):
-            yield self.data[i]
+        for i in range(self.length):
+            yield self._data[i]
+
+
+    ### views ###
+
+    class View:
+        """A read-only view of a range of an ArrayList's elements, which shares
+        the list's store instead of copying it."""
+        _shared = None
+
+        def __init__(self, lst, start, stop):
+            self._shared = lst._share()
+            self._data = lst._data
+            self.start = start
+            self.length = max(0, stop - start)
+
+        def __del__(self):
+            if self._shared is not None:
+                self._shared.count -= 1
+                self._shared = None
+
+        def __getitem__(self, idx):
+            """Implements `x = self[idx]`"""
+            assert(isinstance(idx, int))
+            nidx = idx + self.length if idx < 0 else idx
+            if nidx < 0 or nidx >= self.length:
+                raise IndexError
+            return self._data[self.start + nidx]
+
+        def __len__(self):
+            return self.length
+
+        def __iter__(self):
+            for i in range(self.start, self.start + self.length):
+                yield self._data[i]
+
+        def __contains__(self, value):
+            for x in self:
+                if x == value:
+                    return True
+            return False
+
+        def __repr__(self):
+            return 'view[' + ', '.join(str(x) for x in self) + ']'
 
 
 # In[33]:
@@ -441,7 +857,7 @@ for _ in range(100):
     lst.append(to_add)
 
 tc.assertIsInstance(lst.data, ConstrainedList)
-tc.assertEqual(data, lst.data._as_list())
+tc.assertEqual(data, lst.data._as_list()[:len(lst)])
 
 for _ in range(100):
     to_ins = random.randrange(1000)
@@ -449,20 +865,20 @@ for _ in range(100):
     data.insert(ins_idx, to_ins)
     lst.insert(ins_idx, to_ins)
 
-tc.assertEqual(data, lst.data._as_list())
+tc.assertEqual(data, lst.data._as_list()[:len(lst)])
 
 for _ in range(100):
     pop_idx = random.randrange(len(data))
     tc.assertEqual(data.pop(pop_idx), lst.pop(pop_idx))
     
-tc.assertEqual(data, lst.data._as_list())
+tc.assertEqual(data, lst.data._as_list()[:len(lst)])
 
 for _ in range(25):
     to_rem = data[random.randrange(len(data))]
     data.remove(to_rem)
     lst.remove(to_rem)
     
-tc.assertEqual(data, lst.data._as_list())
+tc.assertEqual(data, lst.data._as_list()[:len(lst)])
 
 with tc.assertRaises(ValueError):
     lst.remove(9999)
@@ -553,7 +969,7 @@ lst.data = ConstrainedList(data)
 lst2.data = ConstrainedList(data2)
 lst3 = lst + lst2
 tc.assertEqual(100, len(lst3))
-tc.assertEqual(data + data2, lst3.data._as_list())
+tc.assertEqual(data + data2, lst3.data._as_list()[:len(lst3)])
 
 lst.clear()
 tc.assertEqual([], lst.data._as_list())
@@ -561,15 +977,15 @@ tc.assertEqual([], lst.data._as_list())
 lst.data = ConstrainedList([random.randrange(1000) for _ in range(50)])
 lst2 = lst.copy()
 tc.assertIsNot(lst, lst2)
-tc.assertIsNot(lst.data, lst2.data)
-tc.assertEqual(lst.data._as_list(), lst2.data._as_list())
+tc.assertIs(lst.data, lst2.data)  # shared until either list is modified
+tc.assertEqual(lst.data._as_list()[:len(lst)], lst2.data._as_list()[:len(lst2)])
 
 lst.clear()
 lst.extend(range(10))
 lst.extend(range(10,0,-1))
 lst.extend(data.copy())
 tc.assertEqual(70, len(lst))
-tc.assertEqual(list(range(10))+list(range(10,0,-1))+data, lst.data._as_list())
+tc.assertEqual(list(range(10))+list(range(10,0,-1))+data, lst.data._as_list()[:len(lst)])
 
 
 # In[ ]:
@@ -596,5 +1012,674 @@ for x in data:
 # In[ ]:
 
 
+# test capacity management
+
+from unittest import TestCase
+tc = TestCase()
+lst = ArrayList()
+
+for i in range(1000):
+    lst.append(i)
+tc.assertEqual(1000, len(lst))
+tc.assertEqual(1024, lst.capacity)
+tc.assertEqual(list(range(1000)), [x for x in lst])
+tc.assertEqual(9, lst.resizes)  # 4, 8, 16, ..., 1024
+
+for _ in range(900):
+    lst.pop()
+tc.assertEqual(list(range(100)), [x for x in lst])
+tc.assertLessEqual(lst.capacity, 4 * len(lst))
+tc.assertEqual([None] * (lst.capacity - len(lst)), lst.data._as_list()[len(lst):])
+
+lst.shrink_to_fit()
+tc.assertEqual(100, lst.capacity)
+resizes = lst.resizes
+lst.reserve(500)
+tc.assertEqual(500, lst.capacity)
+for i in range(400):
+    lst.append(i)
+tc.assertEqual(resizes + 1, lst.resizes)
+
+lst.clear()
+tc.assertEqual(0, lst.capacity)
+lst.reserve(10)
+tc.assertIsInstance(lst.data, ConstrainedList)
+tc.assertEqual(0, len(lst))
+with tc.assertRaises(IndexError):
+    lst[0]
+
+
+# In[ ]:
+
+
+# test slices
+
+from unittest import TestCase
+import random
+tc = TestCase()
+
+data = list(range(100))
+lst = ArrayList()
+lst.extend(data)
+
+for slc in (slice(None), slice(10, 20), slice(-10, None), slice(None, None, 3),
+            slice(90, 10, -7), slice(50, 10), slice(200, 300)):
+    tc.assertIsInstance(lst[slc], ArrayList)
+    tc.assertEqual(data[slc], [x for x in lst[slc]])
+
+lst[10:20] = data[10:20] = ['a', 'b']
+lst[0:0] = data[0:0] = range(5)
+lst[-3:] = data[-3:] = 'xyzw'
+lst[::4] = data[::4] = [None] * len(data[::4])
+lst[::-5] = data[::-5] = range(len(data[::-5]))
+tc.assertEqual(data, [x for x in lst])
+with tc.assertRaises(ValueError):
+    lst[::2] = [1, 2]
+
+lst[:] = lst
+tc.assertEqual(data, [x for x in lst])
+
+for _ in range(50):
+    a, b = random.randrange(-20, len(data)+20), random.randrange(-20, len(data)+20)
+    step = random.choice((None, 1, 2, 3, -1, -4))
+    del lst[a:b:step]
+    del data[a:b:step]
+    tc.assertEqual(data, [x for x in lst])
+    if len(data) < 10:
+        lst.extend(range(100))
+        data.extend(range(100))
+
+lst.clear()
+lst.extend(range(10000))
+del lst[100:]
+tc.assertEqual(list(range(100)), [x for x in lst])
+tc.assertLessEqual(lst.capacity, 4 * len(lst))
+
+
+# In[ ]:
+
+
+# test bulk insertion
+
+from unittest import TestCase
+import random
+tc = TestCase()
+
+lst = ArrayList()
+data = []
+for _ in range(50):
+    to_ins = [random.randrange(1000) for _ in range(random.randrange(20))]
+    ins_idx = random.randrange(len(data)+1)
+    data[ins_idx:ins_idx] = to_ins
+    lst.insert_many(ins_idx, iter(to_ins))
+tc.assertEqual(data, [x for x in lst])
+
+with tc.assertRaises(IndexError):
+    lst.insert_many(len(lst)+1, [1])
+
+lst.extend(x * 2 for x in range(10))
+lst.extend(lst)
+data.extend(x * 2 for x in range(10))
+data.extend(data)
+tc.assertEqual(data, [x for x in lst])
+
+lst = ArrayList()
+lst.extend(range(1000))
+resizes = lst.resizes
+lst.insert_many(500, range(5000))
+tc.assertEqual(resizes + 1, lst.resizes)
+tc.assertEqual(list(range(500)) + list(range(5000)) + list(range(500, 1000)), [x for x in lst])
+
+# mappings contribute their keys, and aren't indexed by position
+lst = ArrayList()
+lst.extend({0: 'x', 5: 'y'})
+lst.insert_many(1, {'a': 0})
+tc.assertEqual([0, 'a', 5], [x for x in lst])
+
+# other sized iterables (e.g., linked lists, where indexing walks the list)
+# are iterated over, rather than indexed
+class Walked:
+    def __init__(self, n):
+        self.n = n
+    def __len__(self):
+        return self.n
+    def __iter__(self):
+        return iter(range(self.n))
+    def __getitem__(self, idx):
+        raise AssertionError('indexed by position')
+lst = ArrayList()
+lst.extend(Walked(100))
+lst.insert_many(0, Walked(100))
+tc.assertEqual(list(range(100)) * 2, [x for x in lst])
+
+
+# In[ ]:
+
+
+# test truncated repr
+
+from unittest import TestCase
+tc = TestCase()
+
+lst = ArrayList()
+lst.extend(range(1000))
+tc.assertEqual(str(list(range(1000))), str(lst))
+tc.assertEqual(str(list(range(100)))[:-1] + ', ... 900 more]', repr(lst))
+
+lst.repr_limit = 3
+tc.assertEqual('[0, 1, 2, ... 997 more]', repr(lst))
+lst.repr_limit = 0
+tc.assertEqual('[... 1000 more]', repr(lst))
+lst.repr_limit = None
+tc.assertEqual(str(lst), repr(lst))
+
+lst = ArrayList()
+lst.extend(range(3))
+lst.repr_limit = 3
+tc.assertEqual('[0, 1, 2]', repr(lst))
+
+# elements that render as empty strings are still separated from the summary
+lst = ArrayList()
+lst.extend(['', 'x'])
+lst.repr_limit = 1
+tc.assertEqual('[, ... 1 more]', repr(lst))
+
+
+# ### `TypedArrayList`
+# 
+# A variant of `ArrayList` for numeric data, which stores its elements unboxed in an `array.array` of the given type code (e.g., `'d'` for doubles or `'q'` for 64-bit integers) instead of a `ConstrainedList`. It supports the same API, and additionally exposes its contents for zero-copy handoff: its `memoryview()` method returns a view over the live elements (which works on any Python 3 version), and on Python 3.12+ --- where classes can implement the buffer protocol by defining `__buffer__` --- `memoryview(lst)` and other buffer consumers can take the list directly. On earlier versions, `memoryview(lst)` raises `TypeError`, so use the method.
+
+# In[ ]:
+
+
+from array import array
+from operator import countOf
+
+class TypedArrayList(ArrayList):
+    _exported = None # the store last handed out by memoryview()
+
+    def __init__(self, typecode):
+        self.typecode = typecode
+        super().__init__()
+
+    def _new_store(self):
+        return array(self.typecode)
+
+    def _copy_store(self):
+        return self._data[:]
+
+    def _new_list(self):
+        return TypedArrayList(self.typecode)
+
+    def _resize(self, capacity):
+        if capacity > len(self._data):
+            self._data.frombytes(bytes((capacity - len(self._data)) * self._data.itemsize))
+        else:
+            del self._data[capacity:]
+        self.resizes += 1
+
+    def _move(self, src, dst, n):
+        self._data[dst:dst+n] = self._data[src:src+n]
+
+    def _clear(self, start, stop):
+        pass # unboxed values hold no references
+
+    def insert_many(self, idx, values):
+        if self._shared is not None:
+            self._own()
+        if idx > self.length or idx < 0:
+            raise IndexError
+        # converting first both type-checks all values before the list is
+        # changed and lets them be copied in with a single slice assignment
+        values = array(self.typecode, values)
+        self._open_gap(idx, len(values))
+        self._data[idx:idx+len(values)] = values
+
+    def sort(self, key=None, reverse=False):
+        # the merge passes may leave the result in the scratch store; copy it
+        # back, so that memoryviews of the list show the sorted elements
+        if self._shared is not None:
+            self._own()
+        store = self._data
+        super().sort(key, reverse)
+        if self._data is not store:
+            store[:self.length] = self._data[:self.length]
+            self._data = store
+
+    def _elements(self):
+        """Returns a memoryview over the elements, for reading them in place."""
+        return memoryview(self._data)[:self.length]
+
+    def memoryview(self):
+        """Returns a memoryview over the elements of this list, without copying.
+        The list can't be resized (by adding or removing elements) until the
+        view has been released. Writes through the view only reach this list:
+        a store still shared with copies or views is first copied, and copies
+        and views taken while the view may be live get stores of their own."""
+        if self._shared is not None:
+            self._own()
+        self._exported = self._data
+        return self._elements()
+
+    def __buffer__(self, flags):
+        return self.memoryview()
+
+    def copy(self):
+        if self._exported is not self._data:
+            return super().copy()
+        copy_list = self._new_list()
+        copy_list._data = self._data[:]
+        copy_list.length = self.length
+        return copy_list
+
+    def view(self, start=0, stop=None):
+        if self._exported is not self._data:
+            return super().view(start, stop)
+        return self.copy().view(start, stop)
+
+    ### queries over the raw buffer ###
+
+    def __contains__(self, value):
+        return value in self._elements()
+
+    def min(self):
+        if self.length == 0:
+            raise ValueError('min() of empty list')
+        return min(self._elements())
+
+    def max(self):
+        if self.length == 0:
+            raise ValueError('max() of empty list')
+        return max(self._elements())
+
+    def count(self, value):
+        return countOf(self._elements(), value)
+
+    def index(self, value, i=0, j=None):
+        if j == None:
+            j = self.length
+        i = self._normalize_idx(i)
+        j = min(self._normalize_idx(j), self.length)
+        return self._data.index(value, i, max(i, j))
+
+
+# In[ ]:
+
+
+# test typed lists
+
+from unittest import TestCase
+import random
+tc = TestCase()
+
+data = [random.randrange(-1000, 1000) for _ in range(1000)]
+lst = TypedArrayList('q')
+lst.extend(data)
+tc.assertIsInstance(lst.data, array)
+tc.assertEqual(data, [x for x in lst])
+tc.assertEqual(min(data), lst.min())
+tc.assertEqual(max(data), lst.max())
+for x in data[:50]:
+    tc.assertEqual(data.index(x), lst.index(x))
+    tc.assertEqual(data.count(x), lst.count(x))
+    tc.assertTrue(x in lst)
+tc.assertFalse(0 in lst[:0])
+with tc.assertRaises(ValueError):
+    lst.index(1000)
+with tc.assertRaises(ValueError):
+    lst.index(data[0], 1, 1)
+
+del lst[100:]
+del data[100:]
+tc.assertEqual(data.count(0), lst.count(0))  # stale values in spare capacity aren't counted
+lst.insert(0, 5)
+data.insert(0, 5)
+lst[10:20] = data[10:20] = [7, 8, 9]
+tc.assertEqual(data, [x for x in lst])
+tc.assertIsInstance(lst[::2], TypedArrayList)
+tc.assertIsInstance(lst.copy(), TypedArrayList)
+tc.assertEqual(data + data, [x for x in lst + lst])
+with tc.assertRaises(TypeError):
+    lst.append('a')
+with tc.assertRaises(TypeError):
+    lst.insert_many(5, [1, 2, 'a'])
+tc.assertEqual(data, [x for x in lst])
+lst.insert_many(len(lst) // 2, lst)
+data[len(data) // 2:len(data) // 2] = data
+tc.assertEqual(data, [x for x in lst])
+del lst[len(lst) // 2:]
+del data[len(data) // 2:]
+
+view = lst.memoryview()
+tc.assertEqual(len(data), len(view))
+tc.assertEqual(8, view.itemsize)
+tc.assertEqual(data, view.tolist())
+with tc.assertRaises(BufferError):
+    lst.extend(range(1000))
+view.release()
+
+# the view returned by the method shares the list's store (so writes go both
+# ways); memoryview(lst) itself only works where __buffer__ is supported
+import sys
+view = lst.memoryview()
+view[0] = -1
+tc.assertEqual(-1, lst[0])
+lst[1] = -2
+tc.assertEqual(-2, view[1])
+tc.assertEqual(len(data) * 8, len(view.tobytes()))
+view.release()
+if sys.version_info >= (3, 12):
+    tc.assertEqual(lst[0], memoryview(lst)[0])
+else:
+    with tc.assertRaises(TypeError):
+        memoryview(lst)
+
+# writes through a memoryview don't reach copies or views, whether they were
+# taken before or after it
+lst = TypedArrayList('q')
+lst.extend(range(10))
+copy = lst.copy()
+view = lst.memoryview()
+view[0] = 99
+tc.assertEqual(99, lst[0])
+tc.assertEqual(list(range(10)), [x for x in copy])
+copy, lst_view = lst.copy(), lst.view(0, 3)
+view[1] = 98
+tc.assertEqual(98, lst[1])
+tc.assertEqual([99, 1, 2], [x for x in copy][:3])
+tc.assertEqual([99, 1, 2], [x for x in lst_view])
+view.release()
+
+# sorting keeps the list in the store a live memoryview shows
+for n in (3, 5, 100):
+    lst = TypedArrayList('q')
+    data = [random.randrange(1000) for _ in range(n)]
+    lst.extend(data)
+    view = lst.memoryview()
+    lst.sort()
+    tc.assertEqual(sorted(data), view.tolist())
+    lst.sort(reverse=True)
+    tc.assertEqual(sorted(data, reverse=True), view.tolist())
+    view.release()
+
+lst = TypedArrayList('d')
+lst.extend([1.5, 2.5])
+tc.assertEqual('[1.5, 2.5]', str(lst))
+lst.clear()
+tc.assertEqual(0, len(lst))
+
+
+# ### `FastArrayList`
+# 
+# `ConstrainedList` is there to keep the `ArrayList` implementation honest, but its checks make every slot access a Python-level call. `FastArrayList` has the same API and behavior as `ArrayList`, but is backed by a plain Python list, so that block moves and scans (`in`, `count`, `index`, `min` and `max`) run at native speed.
+
+# In[ ]:
+
+
+from itertools import islice
+
+class FastArrayList(ArrayList):
+    def _new_store(self):
+        return []
+
+    def _copy_store(self):
+        return self._data[:]
+
+    def _new_list(self):
+        return FastArrayList()
+
+    def _resize(self, capacity):
+        if capacity > len(self._data):
+            self._data.extend([None] * (capacity - len(self._data)))
+        else:
+            del self._data[capacity:]
+        self.resizes += 1
+
+    def _move(self, src, dst, n):
+        self._data[dst:dst+n] = self._data[src:src+n]
+
+    def _clear(self, start, stop):
+        self._data[start:stop] = [None] * (stop - start)
+
+    ### scans over the live slots ###
+
+    def __contains__(self, value):
+        return value in islice(self._data, self.length)
+
+    def min(self):
+        if self.length == 0:
+            raise ValueError('min() of empty list')
+        return min(islice(self._data, self.length))
+
+    def max(self):
+        if self.length == 0:
+            raise ValueError('max() of empty list')
+        return max(islice(self._data, self.length))
+
+    def count(self, value):
+        return countOf(islice(self._data, self.length), value)
+
+    def index(self, value, i=0, j=None):
+        if j == None:
+            j = self.length
+        i = self._normalize_idx(i)
+        j = min(self._normalize_idx(j), self.length)
+        return self._data.index(value, i, max(i, j))
+
+    def __iter__(self):
+        return islice(self._data, self.length)
+
+
+# In[ ]:
+
+
+# test fast lists
+
+from unittest import TestCase
+import random
+tc = TestCase()
+
+lst = FastArrayList()
+data = []
+for _ in range(100):
+    to_ins = random.randrange(1000)
+    ins_idx = random.randrange(len(data)+1)
+    data.insert(ins_idx, to_ins)
+    lst.insert(ins_idx, to_ins)
+tc.assertIsInstance(lst.data, list)
+tc.assertEqual(data, [x for x in lst])
+
+for _ in range(25):
+    to_rem = data[random.randrange(len(data))]
+    data.remove(to_rem)
+    lst.remove(to_rem)
+for _ in range(25):
+    pop_idx = random.randrange(len(data))
+    tc.assertEqual(data.pop(pop_idx), lst.pop(pop_idx))
+tc.assertEqual(data, [x for x in lst])
+with tc.assertRaises(ValueError):
+    lst.remove(9999)
+with tc.assertRaises(IndexError):
+    lst[len(data)]
+
+tc.assertEqual(min(data), lst.min())
+tc.assertEqual(max(data), lst.max())
+tc.assertFalse(None in lst)
+for x in data:
+    tc.assertTrue(x in lst)
+    tc.assertEqual(data.index(x), lst.index(x))
+    tc.assertEqual(data.count(x), lst.count(x))
+with tc.assertRaises(ValueError):
+    lst.index(data[0], 1, 1)
+
+lst[5:10] = data[5:10] = range(20)
+del lst[::3]
+del data[::3]
+tc.assertEqual(data, [x for x in lst])
+tc.assertIsInstance(lst + lst, FastArrayList)
+tc.assertEqual(data + data, [x for x in lst + lst])
+tc.assertEqual(lst, lst.copy())
+
+
+# In[ ]:
+
+
+# test sorting and binary search
+
+from unittest import TestCase
+import random
+tc = TestCase()
+
+for n in (0, 1, 2, 7, 100, 1000):
+    data = [random.randrange(100) for _ in range(n)]
+    lst = ArrayList()
+    lst.extend(data)
+    lst.sort()
+    tc.assertEqual(sorted(data), [x for x in lst])
+    lst.sort(reverse=True)
+    tc.assertEqual(sorted(data, reverse=True), [x for x in lst])
+
+# stability, with and without reverse
+data = [(random.randrange(10), i) for i in range(500)]
+lst = ArrayList()
+lst.extend(data)
+lst.sort(key=lambda p: p[0])
+tc.assertEqual(sorted(data, key=lambda p: p[0]), [x for x in lst])
+lst.sort(key=lambda p: p[0], reverse=True)
+tc.assertEqual(sorted(data, key=lambda p: p[0], reverse=True), [x for x in lst])
+
+import bisect
+data = sorted(random.randrange(100) for _ in range(200))
+lst = ArrayList()
+lst.extend(data)
+for x in range(-1, 102):
+    tc.assertEqual(bisect.bisect_left(data, x), lst.bisect_left(x))
+    tc.assertEqual(bisect.bisect_right(data, x), lst.bisect_right(x))
+    tc.assertEqual(bisect.bisect_left(data, x, 50, 150), lst.bisect_left(x, 50, 150))
+for _ in range(100):
+    x = random.randrange(100)
+    bisect.insort(data, x)
+    lst.insort(x)
+tc.assertEqual(data, [x for x in lst])
+
+lst = TypedArrayList('d')
+lst.extend(random.random() for _ in range(100))
+lst.sort(key=lambda x: -x)
+tc.assertEqual(sorted(lst, reverse=True), [x for x in lst])
+tc.assertEqual(0, lst.bisect_right(-2.0, key=lambda x: -x))
+tc.assertEqual(100, lst.bisect_left(0.5, key=lambda x: -x))
+lst.insort(2.0, key=lambda x: -x)
+tc.assertEqual(2.0, lst[0])
+
+# sorting merges between stores of the list's own kind, calling key once per
+# element, and leaves copies (which share the store) untouched
+for lst in (ArrayList(), FastArrayList(), TypedArrayList('q')):
+    data = [random.randrange(1000) for _ in range(300)]
+    lst.extend(data)
+    capacity, copy = lst.capacity, lst.copy()
+    calls = []
+    lst.sort(key=lambda x: calls.append(x) or -x)
+    tc.assertEqual(300, len(calls))
+    tc.assertEqual(sorted(data, reverse=True), [x for x in lst])
+    tc.assertEqual(data, [x for x in copy])
+    tc.assertEqual(capacity, lst.capacity)
+    tc.assertIs(type(copy.data), type(lst.data))
+    lst.sort()
+    tc.assertEqual(sorted(data), [x for x in lst])
+
+
+# In[ ]:
+
+
+# test aggregates
+
+from unittest import TestCase
+import random
+tc = TestCase()
+
+data = [random.randrange(-1000, 1000) for _ in range(1000)]
+lst = ArrayList()
+lst.extend(data)
+tc.assertEqual({'min': min(data), 'max': max(data), 'sum': sum(data),
+                'argmin': data.index(min(data)), 'argmax': data.index(max(data))},
+               lst.stats())
+tc.assertEqual((sum(data), data.count(data[0]), max(data)),
+               lst.aggregate('sum', 'count', 'max', value=data[0]))
+tc.assertEqual((min(data, key=abs), sum(map(abs, data))),
+               lst.aggregate('min', 'sum', key=abs))
+tc.assertEqual((), lst.aggregate())
+
+with tc.assertRaises(ValueError):
+    lst.aggregate('median')
+with tc.assertRaises(ValueError):
+    lst.aggregate('count')
+
+lst = ArrayList()
+tc.assertEqual((0, 0), lst.aggregate('sum', 'count', value=None))
+with tc.assertRaises(ValueError):
+    lst.stats()
+
+lst = FastArrayList()
+lst.extend(['pear', 'fig', 'banana', 'kiwi'])
+tc.assertEqual(('fig', 'banana', 2, 0, 1), lst.aggregate('min', 'max', 'argmax', 'count', 'argmin',
+                                                         key=len, value='apple'))
+
+
+# In[ ]:
+
+
+# test copy-on-write copies and views
+
+from unittest import TestCase
+tc = TestCase()
+
+for make in (ArrayList, FastArrayList, lambda: TypedArrayList('q')):
+    lst = make()
+    lst.extend(range(100))
+    lst2 = lst.copy()
+    lst3 = lst2.copy()
+    tc.assertIs(lst.data, lst3.data)
+
+    lst2.append(100)
+    tc.assertIsNot(lst.data, lst2.data)
+    tc.assertIs(lst.data, lst3.data)
+    tc.assertEqual(list(range(100)), [x for x in lst])
+    tc.assertEqual(list(range(101)), [x for x in lst2])
+
+    del lst3[0]
+    tc.assertIsNot(lst.data, lst3.data)
+    tc.assertEqual(list(range(100)), [x for x in lst])
+    tc.assertEqual(list(range(1, 100)), [x for x in lst3])
+
+    # lst no longer shares its store, so modifying it doesn't copy
+    data = lst.data
+    lst[0] = 50
+    tc.assertIs(data, lst.data)
+
+    v = lst.view(10, 20)
+    tc.assertEqual(10, len(v))
+    tc.assertEqual(list(range(10, 20)), [x for x in v])
+    tc.assertEqual(19, v[-1])
+    tc.assertTrue(15 in v)
+    tc.assertFalse(20 in v)
+    with tc.assertRaises(IndexError):
+        v[10]
+    lst.sort(reverse=True)
+    tc.assertIsNot(data, lst.data)
+    tc.assertEqual(list(range(10, 20)), [x for x in v])
+    tc.assertEqual(0, len(lst.view(-5, 3)))
+    tc.assertEqual([x for x in lst][-5:], [x for x in lst.view(-5)])
+
+    # once the copies are gone, the store is no longer shared
+    lst2 = lst.copy()
+    del lst2
+    data = lst.data
+    lst.append(0)
+    tc.assertIs(data, lst.data)
+
+
+# In[ ]:
+
+
 
 
@@ -0,0 +1,150 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+"""Benchmarks the operations of the array-backed lists in arraylist.py against
+the built-in list.
+
+For each list size n, every operation is timed on a list that already holds n
+elements. The report shows the time per operation, how that compares to the
+built-in list, and how many times the backing store was resized (reallocated)
+while the operations ran.
+
+Usage:
+
+    python arraylist_bench.py [--sizes 1000 10000 ...] [--impls ArrayList ...]
+                              [--ops append insert_front ...] [--repeat 3]
+
+Operations that cost O(n) each (front/middle inserts, `remove`, `in`) are run
+fewer times on large lists, so that every measurement does about the same
+amount of work.
+"""
+
+import argparse
+from time import perf_counter
+
+from arraylist import ArrayList, FastArrayList, TypedArrayList
+
+
+IMPLS = {
+    'list':           list,
+    'ArrayList':      ArrayList,
+    'FastArrayList':  FastArrayList,
+    'TypedArrayList': lambda: TypedArrayList('q'),
+}
+
+# number of repetitions of the O(1) operations, and the total number of
+# element moves/comparisons allowed for each O(n) one
+CHEAP_OPS = 1000
+WORK_BUDGET = 10 ** 6
+
+
+### operations ###
+# each takes a list of n elements and returns the number of operations run ---
+# along with the list built, for operations that build a new one, so that its
+# resizes are reported rather than those of the list operated on
+
+def op_append(lst, n):
+    for i in range(CHEAP_OPS):
+        lst.append(i)
+    return CHEAP_OPS
+
+def _linear_ops(n):
+    return max(1, min(CHEAP_OPS, WORK_BUDGET // n))
+
+def op_insert_front(lst, n):
+    k = _linear_ops(n)
+    for i in range(k):
+        lst.insert(0, i)
+    return k
+
+def op_insert_middle(lst, n):
+    k = _linear_ops(n)
+    for i in range(k):
+        lst.insert(n // 2, i)
+    return k
+
+def op_insert_end(lst, n):
+    for i in range(CHEAP_OPS):
+        lst.insert(len(lst), i)
+    return CHEAP_OPS
+
+def op_pop(lst, n):
+    k = min(CHEAP_OPS, n)
+    for _ in range(k):
+        lst.pop()
+    return k
+
+def op_remove(lst, n):
+    k = min(_linear_ops(n), n // 2)
+    for i in range(k):
+        lst.remove(n // 2 + i)
+    return k
+
+def op_contains(lst, n):
+    k = _linear_ops(n)
+    for _ in range(k):
+        (n - 1) in lst
+    return k
+
+def op_extend(lst, n):
+    lst.extend(range(n))
+    return 1
+
+def op_add(lst, n):
+    return 1, lst + lst
+
+def op_iterate(lst, n):
+    for _ in lst:
+        pass
+    return 1
+
+OPS = {name[3:]: fn for name, fn in globals().items() if name.startswith('op_')}
+
+
+### measurement ###
+
+def measure(make, op, n, repeat):
+    """Runs `op` on fresh lists of n elements built by `make`, and returns the
+    best time per operation (in seconds) along with the number of store
+    resizes the operation caused --- in the list it built, if any --- (None
+    for lists that don't count them)."""
+    best, resizes = None, None
+    for _ in range(repeat):
+        lst = make()
+        lst.extend(range(n))
+        before = getattr(lst, 'resizes', None)
+        start = perf_counter()
+        k = op(lst, n)
+        built = None
+        if isinstance(k, tuple):
+            k, built = k
+        elapsed = (perf_counter() - start) / k
+        if built is not None:
+            resizes = getattr(built, 'resizes', None)
+        elif before is not None:
+            resizes = lst.resizes - before
+        if best is None or elapsed < best:
+            best = elapsed
+    return best, resizes
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10 ** 3, 10 ** 4, 10 ** 5, 10 ** 6])
+    parser.add_argument('--impls', nargs='+', choices=IMPLS, default=list(IMPLS))
+    parser.add_argument('--ops', nargs='+', choices=OPS, default=list(OPS))
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    print('{:<16}{:<14}{:>9}{:>14}{:>10}{:>9}'.format('impl', 'op', 'n', 'us/op', 'x list', 'resizes'))
+    for n in args.sizes:
+        for op_name in args.ops:
+            baseline, _ = measure(list, OPS[op_name], n, args.repeat)
+            for impl in args.impls:
+                t, resizes = measure(IMPLS[impl], OPS[op_name], n, args.repeat)
+                print('{:<16}{:<14}{:>9}{:>14.3f}{:>10.1f}{:>9}'.format(
+                    impl, op_name, n, t * 1e6, t / baseline, '-' if resizes is None else resizes))
+        print()
+
+
+if __name__ == '__main__':
+    main()
@@ -33,30 +33,155 @@
 # In[15]:
 
 
+import operator
+
 class LinkedList:
     class Node:
+        __slots__ = ('val', 'prior', 'next')
+
         def __init__(self, val, prior=None, next=None):
             self.val = val
             self.prior = prior
             self.next  = next
+
+    class Cursor:
+        """A position in a LinkedList --- either at one of its nodes, or at
+        the head sentinel (which sits between the last and first nodes) ---
+        through which the list can be traversed and modified in O(1) time per
+        step. A cursor is false when it is at the head sentinel.
+
+        Modifying the list other than through a cursor may invalidate it (i.e.,
+        if its node is removed)."""
+        def __init__(self, lst, node):
+            self.lst = lst
+            self.node = node
+
+        def __bool__(self):
+            return self.node is not self.lst.head
+
+        def next(self):
+            """Moves to the next node (wrapping around through the head
+            sentinel), and returns this cursor."""
+            self.node = self.node.next
+            return self
+
+        def prev(self):
+            """Moves to the prior node (wrapping around through the head
+            sentinel), and returns this cursor."""
+            self.node = self.node.prior
+            return self
+
+        def get(self):
+            """Returns the value at this cursor."""
+            if not self:
+                raise IndexError
+            return self.node.val
+
+        def set(self, value):
+            """Replaces the value at this cursor."""
+            if not self:
+                raise IndexError
+            self.lst._set_val(self.node, value)
+
+        def insert_before(self, value):
+            """Inserts value before this cursor (i.e., at the end of the list,
+            if the cursor is at the head sentinel). The cursor doesn't move."""
+            self.lst._insert_before(self.node, value)
+
+        def insert_after(self, value):
+            """Inserts value after this cursor (i.e., at the front of the list,
+            if the cursor is at the head sentinel). The cursor doesn't move."""
+            self.lst._insert_before(self.node.next, value)
+
+        def delete(self):
+            """Removes and returns the value at this cursor, which moves on to
+            the following node."""
+            if not self:
+                raise IndexError
+            n = self.node
+            self.node = n.next
+            return self.lst._unlink(n)
     
-    def __init__(self):
+    def __init__(self, pool_size=0):
+        """Creates an empty list. If pool_size is positive, up to that many
+        unlinked nodes are kept on a free list, to be reused by later inserts
+        instead of allocating new ones."""
         self.head = LinkedList.Node(None) # sentinel node (never to be removed)
         self.head.prior = self.head.next = self.head # set up "circular" topology
         self.length = 0
+        self.pool_size = pool_size
+        self.pool = None # free list of nodes, chained through `next`
+        self.pool_count = 0
         
         
     ### prepend and append, below, from class discussion
         
     def prepend(self, value):
-        n = LinkedList.Node(value, prior=self.head, next=self.head.next)
-        self.head.next.prior = self.head.next = n
-        self.length += 1
+        self._insert_before(self.head.next, value)
         
     def append(self, value):
-        n = LinkedList.Node(value, prior=self.head.prior, next=self.head)
+        self._insert_before(self.head, value)
+
+
+    ### node-level access ###
+
+    def _insert_before(self, node, value):
+        """Links a new node holding value in before node, and returns it."""
+        n = self.pool
+        if n is None:
+            n = self.Node(value, prior=node.prior, next=node)
+        else:
+            self.pool = n.next
+            self.pool_count -= 1
+            n.val, n.prior, n.next = value, node.prior, node
         n.prior.next = n.next.prior = n
         self.length += 1
+        return n
+
+    def _unlink(self, node):
+        """Unlinks node from this list (returning it to the pool, if there's
+        room), and returns its value."""
+        node.prior.next = node.next
+        node.next.prior = node.prior
+        self.length -= 1
+        val = node.val
+        if self.pool_count < self.pool_size:
+            node.val = node.prior = None
+            node.next = self.pool
+            self.pool = node
+            self.pool_count += 1
+        return val
+
+    def _set_val(self, node, value):
+        """Replaces the value held by node."""
+        node.val = value
+
+    def _node_at(self, idx):
+        """Returns the node at index idx, raising IndexError if it is invalid.
+        The walk starts from whichever end of the list is closer, so it takes
+        at most len(self)/2 steps, and only k steps to reach index -k."""
+        if idx < 0:
+            idx += self.length
+            if idx < 0:
+                raise IndexError
+        if idx >= self.length:
+            raise IndexError
+        if idx <= self.length // 2:
+            n = self.head.next
+            for _ in range(idx):
+                n = n.next
+        else:
+            n = self.head.prior
+            for _ in range(self.length - 1 - idx):
+                n = n.prior
+        return n
+
+    def cursor(self, idx=0):
+        """Returns a Cursor at index idx (or at the head sentinel, if idx is
+        len(self))."""
+        if self._normalize_idx(idx) == self.length:
+            return LinkedList.Cursor(self, self.head)
+        return LinkedList.Cursor(self, self._node_at(idx))
             
             
     ### subscript-based access ###
@@ -71,36 +196,17 @@ class LinkedList:
     
     def __getitem__(self, idx):
         assert(isinstance(idx, int))
-        nidx=self._normalize_idx(idx)
-        if nidx>self.length or self.length==0:
-            raise IndexError
-        temp=self.head.next
-        for _ in range(nidx):
-            temp=temp.next
-        return temp.val
+        return self._node_at(idx).val
+
     def __setitem__(self, idx, value):
         """Implements `self[idx] = x`"""
         assert(isinstance(idx, int))
-        nidx=self._normalize_idx(idx)
-        if nidx>self.length or self.length==0:
-            raise IndexError
-        temp=self.head.next
-        for _ in range(nidx):
-            temp=temp.next
-        temp.val=value
+        self._set_val(self._node_at(idx), value)
 
     def __delitem__(self, idx):
         """Implements `del self[idx]`"""
         assert(isinstance(idx, int))
-        nidx=self._normalize_idx(idx)
-        if nidx>self.length or self.length==0:
-            raise IndexError
-        temp=self.head.next
-        for _ in range(nidx):
-            temp=temp.next
-        temp.prior.next=temp.next
-        temp.next.prior=temp.prior
-        self.length-=1
+        self._unlink(self._node_at(idx))
     
 
     ### stringification ###
@@ -127,30 +233,25 @@ class LinkedList:
         assert(isinstance(idx, int))
         nidx = self._normalize_idx(idx)
 
-        if nidx == self.length:
+        if nidx >= self.length:
             self.append(value)
         else:
-            self.length += 1
-            n = self.head.next
-            for i in range(nidx):
-                n = n.next
-            newNode = LinkedList.Node(val=value, next=n, prior=n.prior)
-            n.prior.next = n.prior = newNode
+            self._insert_before(self._node_at(nidx), value)
     
     def pop(self, idx=-1):
         """Deletes and returns the element at idx (which is the last element,
         by default)."""
-        rv = self.__getitem__(idx)
-        self.__delitem__(idx)
-        return rv
+        return self._unlink(self._node_at(idx))
     
     def remove(self, value):
         """Removes the first (closest to the front) instance of value from the
         list. Raises a ValueError if value is not found in the list."""
-        for i in range(self.length):
-            if self[i] == value:
-                self.__delitem__(i)
+        n = self.head.next
+        while n is not self.head:
+            if n.val == value:
+                self._unlink(n)
                 return
+            n = n.next
         raise ValueError
 
     ### predicates (T/F queries) ###
@@ -162,12 +263,13 @@ class LinkedList:
             return False
         if len(other) != len(self):
             return False
-        j = 0
-        for i in other:
-            if i != self[j]:
+        n, m = self.head.next, other.head.next
+        while n is not self.head:
+            if n.val != m.val:
                 return False
-            j += 1
+            n, m = n.next, m.next
         return True
+
     def __contains__(self, value):
         """Implements `val in self`. Returns true if value is found in this list."""
         for i in self:
@@ -183,18 +285,26 @@ class LinkedList:
     
     def min(self):
         """Returns the minimum value in this list."""
-        min = self[0]
-        for val in self:
-            if val < min:
-                min = val
+        n = self.head.next
+        if n is self.head:
+            raise ValueError('min() of empty list')
+        min = n.val
+        while n is not self.head:
+            if n.val < min:
+                min = n.val
+            n = n.next
         return min
     
     def max(self):
         """Returns the maximum value in this list."""
-        max = self[0]
-        for val in self:
-            if val > max:
-                max = val
+        n = self.head.next
+        if n is self.head:
+            raise ValueError('max() of empty list')
+        max = n.val
+        while n is not self.head:
+            if n.val > max:
+                max = n.val
+            n = n.next
         return max
     
     def index(self, value, i=0, j=None):
@@ -202,16 +312,14 @@ class LinkedList:
         this list between index i (inclusive) and j (exclusive). If j is not
         specified, search through the end of the list for value. If value
         is not in the list, raise a ValueError."""
-        if j is None:
-            for i in range(i, len(self)):
-                if self[i] == value:
-                    return i
-        else:
-            i = self._normalize_idx(i)
-            j = self._normalize_idx(j)
-            for i in range(i, j):
-                if self[i] == value:
-                    return i
+        i = self._normalize_idx(i)
+        j = self.length if j is None else min(self._normalize_idx(j), self.length)
+        if i < j:
+            n = self._node_at(i)
+            for idx in range(i, j):
+                if n.val == value:
+                    return idx
+                n = n.next
         raise ValueError('Value Error found, Try Again Later')
 
     
@@ -231,7 +339,7 @@ class LinkedList:
         instance that contains the values in this list followed by those 
         of other."""
         assert(isinstance(other, LinkedList))
-        rv = LinkedList()
+        rv = self._new_list()
         for i in self:
             rv.append(i)
         for j in other:
@@ -239,20 +347,177 @@ class LinkedList:
         return rv
     
     def clear(self):
-        """Removes all elements from this list."""
-        for _ in range(self.length):
-            self.__delitem__(-1)
+        """Removes all elements from this list, in O(1) time (the removed nodes
+        are left to the garbage collector, rather than pooled)."""
+        self.head.prior = self.head.next = self.head
+        self.length = 0
         
     def copy(self):
         """Returns a new LinkedList instance (with separate Nodes), that
         contains the same values as this list."""
-        rv = LinkedList()
+        rv = self._new_list()
         return self.__add__(rv)
     
     def extend(self, other):
         """Adds all elements, in order, from other --- an Iterable --- to this list."""
         for i in other:
             self.append(i)
+
+    def _new_list(self):
+        """Returns a new, empty list of the same kind as this one."""
+        return LinkedList(self.pool_size)
+
+    def _splice_before(self, node, other):
+        """Moves all of other's nodes into this list, before node, in O(1)."""
+        if other is self:
+            raise ValueError('cannot splice a list into itself')
+        if other.length == 0:
+            return
+        first, last, before = other.head.next, other.head.prior, node.prior
+        before.next, first.prior = first, before
+        last.next, node.prior = node, last
+        self.length += other.length
+        other.clear()
+
+    def splice(self, other, idx=None):
+        """Moves all elements of other --- another LinkedList, which is left
+        empty --- into this list at position idx (by default, at the end). The
+        nodes are relinked rather than copied, so this takes O(1) time beyond
+        locating idx."""
+        assert(isinstance(other, LinkedList))
+        if idx is None or self._normalize_idx(idx) >= self.length:
+            self._splice_before(self.head, other)
+        else:
+            self._splice_before(self._node_at(self._normalize_idx(idx)), other)
+
+    def extend_from(self, other):
+        """Moves all elements of other --- another LinkedList, which is left
+        empty --- to the end of this list, in O(1) time."""
+        self.splice(other)
+
+    def split_at(self, idx):
+        """Removes the elements from position idx onwards from this list, and
+        returns them (with their original nodes) as a new list."""
+        nidx = min(self._normalize_idx(idx), self.length)
+        rv = self._new_list()
+        if nidx == self.length:
+            return rv
+        first, last = self._node_at(nidx), self.head.prior
+        self.head.prior, first.prior.next = first.prior, self.head
+        rv.head.next, first.prior = first, rv.head
+        rv.head.prior, last.next = last, rv.head
+        rv.length = self.length - nidx
+        self.length = nidx
+        return rv
+
+    def rotate(self, k=1):
+        """Rotates this list k steps to the right (i.e., moves its last k
+        elements to the front), or to the left if k is negative, by relinking
+        the head sentinel."""
+        if self.length == 0 or k % self.length == 0:
+            return
+        first, h = self._node_at(self.length - k % self.length), self.head
+        h.prior.next, h.next.prior = h.next, h.prior
+        h.prior, h.next = first.prior, first
+        first.prior.next = first.prior = h
+
+    ### sorting ###
+
+    @staticmethod
+    def _before(key, reverse):
+        """Returns a function telling whether its first value must be placed
+        before its second one. Like list.sort, only `<` is used to compare
+        values (or their keys)."""
+        if key is None:
+            return (lambda x, y: y < x) if reverse else operator.lt
+        return (lambda x, y: key(y) < key(x)) if reverse else (lambda x, y: key(x) < key(y))
+
+    @staticmethod
+    def _cut(node, k):
+        """Detaches the run of (at most) k nodes starting at node from the
+        None-terminated chain it heads, and returns the rest of the chain."""
+        for _ in range(k - 1):
+            if node is None:
+                return None
+            node = node.next
+        if node is None:
+            return None
+        rest, node.next = node.next, None
+        return rest
+
+    @staticmethod
+    def _merge_runs(tail, a, b, before):
+        """Links the merge of the None-terminated runs a and b in after tail,
+        taking from a on ties (so merging is stable), and returns the last node
+        linked in. If a comparison raises, the unmerged nodes are still linked
+        in before the exception propagates."""
+        try:
+            while a is not None and b is not None:
+                if before(b.val, a.val):
+                    tail.next, b = b, b.next
+                else:
+                    tail.next, a = a, a.next
+                tail = tail.next
+        finally:
+            for run in (a, b):
+                tail.next = run
+                while tail.next is not None:
+                    tail = tail.next
+        return tail
+
+    def _relink(self):
+        """Restores the prior links (and circularity) of this list, after its
+        nodes were rearranged as a None-terminated chain of next links."""
+        prev, n = self.head, self.head.next
+        while n is not None:
+            n.prior, prev, n = prev, n, n.next
+        prev.next, self.head.prior = self.head, prev
+
+    def sort(self, key=None, reverse=False):
+        """Sorts this list in place, stably, by relinking its nodes --- with a
+        bottom-up merge sort that takes O(n log n) time and O(1) extra space.
+        Note that, as keys aren't cached, key is called on every comparison."""
+        if self.length < 2:
+            return
+        before, h = self._before(key, reverse), self.head
+        tail, cur, width = h, None, 1
+        h.prior.next = None
+        try:
+            while width < self.length:
+                tail, cur = h, h.next
+                while cur is not None:
+                    a = cur
+                    b = self._cut(a, width)
+                    cur = self._cut(b, width)
+                    tail = self._merge_runs(tail, a, b, before)
+                width *= 2
+        except BaseException:
+            # keep all nodes in the list if a comparison raised
+            while tail.next is not None:
+                tail = tail.next
+            tail.next = cur
+            raise
+        finally:
+            self._relink()
+
+    def merge(self, other, key=None, reverse=False):
+        """Merges other --- another LinkedList, which is left empty --- into
+        this list, in linear time, by relinking its nodes. Both lists must be
+        sorted by key (in the order given by reverse); equal elements of this
+        list are placed before those of other."""
+        assert(isinstance(other, LinkedList))
+        m = self.length
+        self._splice_before(self.head, other)
+        if m == 0 or m == self.length:
+            return
+        h = self.head
+        h.prior.next = None
+        try:
+            a = h.next
+            b = self._cut(a, m)
+            self._merge_runs(h, a, b, self._before(key, reverse))
+        finally:
+            self._relink()
             
     ### iteration ###
 
@@ -525,5 +790,2306 @@ for x in data:
 # In[ ]:
 
 
+# test cursors
+
+from unittest import TestCase
+import random
+tc = TestCase()
+
+lst = LinkedList()
+for d in range(10):
+    lst.append(d)
+
+cur = lst.cursor()
+tc.assertEqual(0, cur.get())
+tc.assertEqual(1, cur.next().get())
+cur.set(10)
+cur.insert_before(-1)
+cur.insert_after(11)
+tc.assertEqual([0, -1, 10, 11, 2, 3, 4, 5, 6, 7, 8, 9], [x for x in lst])
+tc.assertEqual(10, cur.delete())
+tc.assertEqual(11, cur.get())
+tc.assertEqual(-1, cur.prev().get())
+tc.assertEqual(11, len(lst))
+
+cur = lst.cursor(len(lst))
+tc.assertFalse(cur)
+with tc.assertRaises(IndexError):
+    cur.get()
+with tc.assertRaises(IndexError):
+    cur.delete()
+cur.insert_before(100)
+cur.insert_after(-100)
+tc.assertEqual(-100, lst[0])
+tc.assertEqual(100, lst[-1])
+tc.assertEqual(9, lst.cursor(-1).prev().get())
+
+# remove every other element, in a single pass
+data = [x for x in lst]
+cur = lst.cursor()
+while cur:
+    cur.delete()
+    if cur:
+        cur.next()
+tc.assertEqual(data[1::2], [x for x in lst])
+
+# scans walk the nodes, rather than re-indexing from the head
+data = [random.randrange(1000) for _ in range(100000)]
+lst = LinkedList()
+for d in data:
+    lst.append(d)
+lst2 = lst.copy()
+tc.assertEqual(lst, lst2)
+tc.assertEqual(min(data), lst.min())
+tc.assertEqual(max(data), lst.max())
+tc.assertEqual(data.index(data[-1]), lst.index(data[-1]))
+lst.remove(data[-1])
+data.remove(data[-1])
+tc.assertEqual(len(data), len(lst))
+
+
+# In[ ]:
+
+
+# test access from either end
+
+from unittest import TestCase
+import random
+tc = TestCase()
+
+data = list(range(1001))
+lst = LinkedList()
+for d in data:
+    lst.append(d)
+
+for i in range(-len(data), len(data)):
+    tc.assertEqual(data[i], lst[i])
+for i in (len(data), -len(data)-1, 10000, -10000):
+    with tc.assertRaises(IndexError):
+        lst[i]
+    with tc.assertRaises(IndexError):
+        lst[i] = 0
+    with tc.assertRaises(IndexError):
+        del lst[i]
+
+for _ in range(200):
+    idx = random.randrange(-len(data), len(data))
+    lst[idx] = data[idx] = random.randrange(1000)
+    idx = random.randrange(-len(data), len(data))
+    del lst[idx]
+    del data[idx]
+    idx = random.randrange(-len(data)-5, len(data)+5)
+    lst.insert(idx, idx)
+    data.insert(idx, idx)
+tc.assertEqual(data, [x for x in lst])
+
+# only k nodes are visited to reach index -k
+lst.head.next.next = None
+tc.assertEqual(data[-3], lst[-3])
+tc.assertEqual(data[len(data) // 2 + 1], lst[len(data) // 2 + 1])
+
+
+# In[ ]:
+
+
+# test node pooling
+
+from unittest import TestCase
+import random
+tc = TestCase()
+
+with tc.assertRaises(AttributeError):
+    LinkedList.Node(0).extra = 1
+
+lst = LinkedList(pool_size=10)
+data = []
+for i in range(20):
+    lst.append(i)
+    data.append(i)
+for _ in range(15):
+    tc.assertEqual(data.pop(), lst.pop())
+tc.assertEqual(10, lst.pool_count)
+pooled = lst.pool
+tc.assertIsNone(pooled.val)
+
+lst.prepend(-1)
+data.insert(0, -1)
+tc.assertIs(pooled, lst.head.next)
+tc.assertEqual(9, lst.pool_count)
+
+for _ in range(500):
+    if random.randrange(2) and data:
+        idx = random.randrange(len(data))
+        tc.assertEqual(data.pop(idx), lst.pop(idx))
+    else:
+        idx = random.randrange(len(data)+1)
+        lst.insert(idx, idx)
+        data.insert(idx, idx)
+    tc.assertLessEqual(lst.pool_count, 10)
+tc.assertEqual(data, [x for x in lst])
+
+lst.clear()
+tc.assertEqual(0, len(lst))
+tc.assertEqual([], [x for x in lst])
+lst.append(1)
+tc.assertEqual([1], [x for x in lst])
+
+
+# In[ ]:
+
+
+# test splicing, splitting and rotation
+
+from unittest import TestCase
+import random
+tc = TestCase()
+
+def make(data):
+    lst = LinkedList()
+    lst.extend(data)
+    return lst
+
+lst, lst2 = make(range(5)), make(range(5, 10))
+first = lst2.head.next
+lst.extend_from(lst2)
+tc.assertEqual(list(range(10)), [x for x in lst])
+tc.assertEqual(10, len(lst))
+tc.assertEqual(0, len(lst2))
+tc.assertEqual([], [x for x in lst2])
+tc.assertIs(first, lst._node_at(5))
+
+lst2.extend('ab')
+lst.splice(lst2, 0)
+lst.splice(make('cd'), -1)
+lst.splice(make('ef'), 100)
+lst.splice(LinkedList(), 3)
+tc.assertEqual(['a', 'b'] + list(range(9)) + ['c', 'd', 9, 'e', 'f'], [x for x in lst])
+with tc.assertRaises(ValueError):
+    lst.splice(lst)
+
+for _ in range(20):
+    data = [random.randrange(100) for _ in range(random.randrange(20))]
+    idx = random.randrange(-25, 25)
+    lst = make(data)
+    tail = lst.split_at(idx)
+    tc.assertEqual(data[:idx], [x for x in lst])
+    tc.assertEqual(data[idx:], [x for x in tail])
+    tc.assertEqual(len(data[idx:]), len(tail))
+    tc.assertEqual(data[idx:][::-1], [tail[i] for i in range(-1, -len(tail)-1, -1)])
+    lst.extend_from(tail)
+    tc.assertEqual(data, [x for x in lst])
+    tc.assertEqual(data[::-1], [lst[i] for i in range(-1, -len(data)-1, -1)])
+
+from collections import deque
+for _ in range(20):
+    data = deque(random.randrange(100) for _ in range(random.randrange(10)))
+    lst = make(data)
+    k = random.randrange(-15, 15)
+    lst.rotate(k)
+    data.rotate(k)
+    tc.assertEqual(list(data), [x for x in lst])
+    tc.assertEqual(list(data)[::-1], [lst[i] for i in range(-1, -len(data)-1, -1)])
+
+
+# In[ ]:
+
+
+# test sorting and merging
+
+from unittest import TestCase
+import random
+tc = TestCase()
+
+def make(data):
+    lst = LinkedList()
+    lst.extend(data)
+    return lst
+
+def nodes(lst):
+    rv, n = [], lst.head.next
+    while n is not lst.head:
+        rv.append(n)
+        n = n.next
+    return rv
+
+for n in list(range(10)) + [100, 1000, 1337]:
+    for key, reverse in ((None, False), (None, True), (lambda t: t[0], False), (lambda t: t[0], True)):
+        data = [(random.randrange(n // 3 + 1), i) for i in range(n)]
+        lst = make(data)
+        before = set(map(id, nodes(lst)))
+        lst.sort(key=key, reverse=reverse)
+        tc.assertEqual(sorted(data, key=key, reverse=reverse), [x for x in lst])
+        tc.assertEqual(sorted(data, key=key, reverse=reverse)[::-1], [lst[i] for i in range(-1, -n-1, -1)])
+        tc.assertEqual(before, set(map(id, nodes(lst))))
+        tc.assertEqual(n, len(lst))
+
+for _ in range(50):
+    data1 = sorted((random.randrange(20), 'a') for _ in range(random.randrange(15)))
+    data2 = sorted((random.randrange(20), 'b') for _ in range(random.randrange(15)))
+    key = lambda t: t[0]
+    lst1, lst2 = make(data1), make(data2)
+    lst1.merge(lst2, key=key)
+    tc.assertEqual(sorted(data1 + data2, key=key), [x for x in lst1])
+    tc.assertEqual(sorted(data1 + data2, key=key)[::-1], [lst1[i] for i in range(-1, -len(lst1)-1, -1)])
+    tc.assertEqual(0, len(lst2))
+    tc.assertEqual([], [x for x in lst2])
+    lst1, lst2 = make(data1[::-1]), make(data2[::-1])
+    lst1.merge(lst2, key=key, reverse=True)
+    tc.assertEqual(sorted(data1 + data2, key=key, reverse=True), [x for x in lst1])
+with tc.assertRaises(ValueError):
+    lst1.merge(lst1)
+
+# a failed comparison leaves all the elements in the list
+data = list(range(100))
+random.shuffle(data)
+lst = make(data + ['x'] + data)
+with tc.assertRaises(TypeError):
+    lst.sort()
+tc.assertEqual(201, len(lst))
+tc.assertEqual(sorted(map(str, data + ['x'] + data)), sorted(map(str, [x for x in lst])))
+tc.assertEqual([x for x in lst][::-1], [lst[i] for i in range(-1, -202, -1)])
+lst = make(range(10))
+with tc.assertRaises(TypeError):
+    lst.merge(make([5, None]))
+tc.assertEqual(sorted(map(str, list(range(10)) + [5, None])), sorted(map(str, [x for x in lst])))
+tc.assertEqual(12, len(lst))
+
+
+# ### `UnrolledLinkedList`
+# 
+# An alternative to `LinkedList` with the same API, in which each node holds up to `chunk_size` values (in a small array) rather than just one. Nodes are split when they overflow, and merged with (or topped up from) a neighbor when they fall below half full, so the list keeps the cheap inserts of a linked list while using far fewer nodes --- which saves memory and makes iteration nearly as fast as for an array.
+# 
+# Cursors address an element by its node and its offset in that node. `splice`, `split_at` and `rotate` relink whole chains of nodes, splitting at most one node at each seam and rebalancing the nodes on either side, so they take O(`chunk_size`) time beyond locating the index. (Lists with different chunk sizes are spliced by copying values instead.) `sort` and `merge` don't relink anything: they sort (or merge) the values, and write them back into the existing nodes chunk by chunk.
+
+# In[ ]:
+
+
+import heapq
+
+class UnrolledLinkedList:
+    class Node:
+        __slots__ = ('vals', 'prior', 'next')
+
+        def __init__(self, vals, prior=None, next=None):
+            self.vals = vals
+            self.prior = prior
+            self.next  = next
+
+    class Cursor:
+        """A position in an UnrolledLinkedList --- either at one of its
+        elements (given by a node and an offset in it), or at the head
+        sentinel --- through which the list can be traversed and modified in
+        O(1) time per step (plus O(chunk_size) when modifying it). A cursor is
+        false when it is at the head sentinel.
+
+        Modifying the list other than through a cursor may invalidate it."""
+        def __init__(self, lst, node, off=0):
+            self.lst = lst
+            self.node = node
+            self.off = off
+
+        def __bool__(self):
+            return self.node is not self.lst.head
+
+        def next(self):
+            """Moves to the next element (wrapping around through the head
+            sentinel), and returns this cursor."""
+            if self and self.off + 1 < len(self.node.vals):
+                self.off += 1
+            else:
+                self.node, self.off = self.node.next, 0
+            return self
+
+        def prev(self):
+            """Moves to the prior element (wrapping around through the head
+            sentinel), and returns this cursor."""
+            if self and self.off > 0:
+                self.off -= 1
+            else:
+                self.node = self.node.prior
+                self.off = len(self.node.vals) - 1 if self else 0
+            return self
+
+        def get(self):
+            """Returns the value at this cursor."""
+            if not self:
+                raise IndexError
+            return self.node.vals[self.off]
+
+        def set(self, value):
+            """Replaces the value at this cursor."""
+            if not self:
+                raise IndexError
+            self.node.vals[self.off] = value
+
+        def insert_before(self, value):
+            """Inserts value before this cursor (i.e., at the end of the list,
+            if the cursor is at the head sentinel). The cursor doesn't move."""
+            self.node, self.off = self.lst._insert_at(self.node, self.off, value, (self.node, self.off))
+
+        def insert_after(self, value):
+            """Inserts value after this cursor (i.e., at the front of the list,
+            if the cursor is at the head sentinel). The cursor doesn't move."""
+            if self:
+                pos = self.lst._insert_at(self.node, self.off + 1, value, (self.node, self.off))
+            else:
+                pos = self.lst._insert_at(self.node.next, 0, value, (self.node, self.off))
+            self.node, self.off = pos
+
+        def delete(self):
+            """Removes and returns the value at this cursor, which moves on to
+            the following element."""
+            if not self:
+                raise IndexError
+            val, (self.node, self.off) = self.lst._delete_at(self.node, self.off)
+            return val
+
+    def __init__(self, chunk_size=64, pool_size=0):
+        """Creates an empty list, whose nodes hold up to chunk_size values.
+        If pool_size is positive, up to that many unlinked nodes are kept on a
+        free list, to be reused instead of allocating new ones."""
+        assert(chunk_size >= 2)
+        self.head = UnrolledLinkedList.Node(None) # sentinel node (never to be removed)
+        self.head.prior = self.head.next = self.head
+        self.chunk_size = chunk_size
+        self.length = 0
+        self.pool_size = pool_size
+        self.pool = None # free list of nodes, chained through `next`
+        self.pool_count = 0
+
+
+    ### node-level access ###
+    # The methods that move values between nodes take, and return, a position
+    # pos --- a (node, offset) pair --- updated to where its element ended up.
+
+    def _insert_node_before(self, node, vals):
+        n = self.pool
+        if n is None:
+            n = UnrolledLinkedList.Node(vals, prior=node.prior, next=node)
+        else:
+            self.pool = n.next
+            self.pool_count -= 1
+            n.vals, n.prior, n.next = vals, node.prior, node
+        n.prior.next = n.next.prior = n
+        return n
+
+    def _unlink_node(self, node):
+        node.prior.next = node.next
+        node.next.prior = node.prior
+        if self.pool_count < self.pool_size:
+            node.vals = node.prior = None
+            node.next = self.pool
+            self.pool = node
+            self.pool_count += 1
+
+    def _locate(self, idx):
+        """Returns the node holding the element at index idx, along with the
+        element's offset in that node, raising IndexError if idx is invalid.
+        The walk starts from whichever end of the list is closer."""
+        if idx < 0:
+            idx += self.length
+            if idx < 0:
+                raise IndexError
+        if idx >= self.length:
+            raise IndexError
+        if idx <= self.length // 2:
+            n = self.head.next
+            while idx >= len(n.vals):
+                idx -= len(n.vals)
+                n = n.next
+            return n, idx
+        else:
+            idx = self.length - 1 - idx
+            n = self.head.prior
+            while idx >= len(n.vals):
+                idx -= len(n.vals)
+                n = n.prior
+            return n, len(n.vals) - 1 - idx
+
+    def _split(self, node, pos=None, at=None):
+        """Moves the values of node from offset at (by default, its back
+        half) into a new node after it, and returns pos, updated."""
+        if at is None:
+            at = len(node.vals) // 2
+        self._insert_node_before(node.next, node.vals[at:])
+        del node.vals[at:]
+        if pos is not None and pos[0] is node and pos[1] >= at:
+            pos = (node.next, pos[1] - at)
+        return pos
+
+    def _rebalance(self, node, pos=None):
+        """Merges an underflowing node with a neighbor, or tops it up with
+        values from that neighbor if they won't fit in a single node, and
+        returns pos, updated."""
+        if len(node.vals) >= self.chunk_size // 2:
+            return pos
+        if not node.vals:
+            if pos is not None and pos[0] is node:
+                pos = (node.next, 0)
+            self._unlink_node(node)
+        elif node.next is not self.head:
+            nxt = node.next
+            if len(node.vals) + len(nxt.vals) <= self.chunk_size:
+                if pos is not None and pos[0] is nxt:
+                    pos = (node, len(node.vals) + pos[1])
+                node.vals.extend(nxt.vals)
+                self._unlink_node(nxt)
+            else:
+                k = (len(nxt.vals) - len(node.vals)) // 2
+                if pos is not None and pos[0] is nxt:
+                    pos = (node, len(node.vals) + pos[1]) if pos[1] < k else (nxt, pos[1] - k)
+                node.vals.extend(nxt.vals[:k])
+                del nxt.vals[:k]
+        elif node.prior is not self.head:
+            return self._rebalance(node.prior, pos)
+        return pos
+
+    def _insert_at(self, node, off, value, pos=None):
+        """Inserts value at offset off in node (or at the end of the list, if
+        node is the head sentinel), and returns pos, updated."""
+        if node is self.head:
+            self.append(value)
+            return pos
+        node.vals.insert(off, value)
+        self.length += 1
+        if pos is not None and pos[0] is node and pos[1] >= off:
+            pos = (node, pos[1] + 1)
+        if len(node.vals) > self.chunk_size:
+            pos = self._split(node, pos)
+        return pos
+
+    def _delete_at(self, node, off):
+        """Removes the value at offset off in node, and returns it along with
+        the position of the element that followed it."""
+        val = node.vals.pop(off)
+        self.length -= 1
+        pos = (node, off) if off < len(node.vals) else (node.next, 0)
+        return val, self._rebalance(node, pos)
+
+    def cursor(self, idx=0):
+        """Returns a Cursor at index idx (or at the head sentinel, if idx is
+        len(self))."""
+        if self._normalize_idx(idx) == self.length:
+            return UnrolledLinkedList.Cursor(self, self.head)
+        return UnrolledLinkedList.Cursor(self, *self._locate(idx))
+            
+            
+    ### subscript-based access ###
+    
+    def _normalize_idx(self, idx):
+        nidx = idx
+        if nidx < 0:
+            nidx += len(self)
+            if nidx < 0:
+                nidx = 0
+        return nidx
+    
+    def __getitem__(self, idx):
+        """Implements `x = self[idx]`"""
+        assert(isinstance(idx, int))
+        n, off = self._locate(idx)
+        return n.vals[off]
+
+    def __setitem__(self, idx, value):
+        """Implements `self[idx] = x`"""
+        assert(isinstance(idx, int))
+        n, off = self._locate(idx)
+        n.vals[off] = value
+
+    def __delitem__(self, idx):
+        """Implements `del self[idx]`"""
+        assert(isinstance(idx, int))
+        self.pop(idx)
+    
+
+    ### stringification ###
+    
+    def __str__(self):
+        """Implements `str(self)`. Returns '[]' if the list is empty, else
+        returns `str(x)` for all values `x` in this list, separated by commas
+        and enclosed by square brackets. E.g., for a list containing values
+        1, 2 and 3, returns '[1, 2, 3]'."""
+        return self.__repr__()
+
+    def __repr__(self):
+        """Supports REPL inspection. (Same behavior as `str`.)"""
+        return '[' + ', '.join(str(x) for x in self) + ']'
+
+
+    ### single-element manipulation ###
+
+    def prepend(self, value):
+        self.insert(0, value)
+        
+    def append(self, value):
+        last = self.head.prior
+        if last is self.head or len(last.vals) >= self.chunk_size:
+            last = self._insert_node_before(self.head, [])
+        last.vals.append(value)
+        self.length += 1
+        
+    def insert(self, idx, value):
+        """Inserts value at position idx, shifting the original elements down the
+        list, as needed. Note that inserting a value at len(self) --- equivalent
+        to appending the value --- is permitted. Raises IndexError if idx is invalid."""
+        assert(isinstance(idx, int))
+        nidx = self._normalize_idx(idx)
+        if nidx >= self.length:
+            self.append(value)
+            return
+        self._insert_at(*self._locate(nidx), value)
+    
+    def pop(self, idx=-1):
+        """Deletes and returns the element at idx (which is the last element,
+        by default)."""
+        return self._delete_at(*self._locate(idx))[0]
+    
+    def remove(self, value):
+        """Removes the first (closest to the front) instance of value from the
+        list. Raises a ValueError if value is not found in the list."""
+        n = self.head.next
+        while n is not self.head:
+            for off in range(len(n.vals)):
+                if n.vals[off] == value:
+                    self._delete_at(n, off)
+                    return
+            n = n.next
+        raise ValueError
+
+
+    ### predicates (T/F queries) ###
+    
+    def __eq__(self, other):
+        """Returns True if this UnrolledLinkedList contains the same elements
+        (in order) as other. If other is not an UnrolledLinkedList, returns
+        False."""
+        if not isinstance(other, UnrolledLinkedList) or len(other) != len(self):
+            return False
+        for x, y in zip(self, other):
+            if x != y:
+                return False
+        return True
+
+    def __contains__(self, value):
+        """Implements `val in self`. Returns true if value is found in this list."""
+        n = self.head.next
+        while n is not self.head:
+            if value in n.vals:
+                return True
+            n = n.next
+        return False
+
+
+    ### queries ###
+    
+    def __len__(self):
+        """Implements `len(self)`"""
+        return self.length
+    
+    def min(self):
+        """Returns the minimum value in this list."""
+        if self.length == 0:
+            raise ValueError('min() of empty list')
+        return min(self)
+    
+    def max(self):
+        """Returns the maximum value in this list."""
+        if self.length == 0:
+            raise ValueError('max() of empty list')
+        return max(self)
+    
+    def index(self, value, i=0, j=None):
+        """Returns the index of the first instance of value encountered in
+        this list between index i (inclusive) and j (exclusive). If j is not
+        specified, search through the end of the list for value. If value
+        is not in the list, raise a ValueError."""
+        i = self._normalize_idx(i)
+        j = self.length if j is None else min(self._normalize_idx(j), self.length)
+        if i < j:
+            n, off = self._locate(i)
+            idx = i
+            while idx < j:
+                vals = n.vals
+                end = min(len(vals), off + j - idx)
+                for k in range(off, end):
+                    if vals[k] == value:
+                        return idx + k - off
+                idx += end - off
+                n, off = n.next, 0
+        raise ValueError
+    
+    def count(self, value):
+        """Returns the number of times value appears in this list."""
+        count = 0
+        n = self.head.next
+        while n is not self.head:
+            count += n.vals.count(value)
+            n = n.next
+        return count
+
+
+    ### bulk operations ###
+
+    def __add__(self, other):
+        """Implements `self + other_list`. Returns a new UnrolledLinkedList
+        instance that contains the values in this list followed by those 
+        of other."""
+        assert(isinstance(other, UnrolledLinkedList))
+        rv = UnrolledLinkedList(self.chunk_size, self.pool_size)
+        rv.extend(self)
+        rv.extend(other)
+        return rv
+    
+    def clear(self):
+        """Removes all elements from this list."""
+        self.head.prior = self.head.next = self.head
+        self.length = 0
+        
+    def copy(self):
+        """Returns a new UnrolledLinkedList instance (with separate Nodes),
+        that contains the same values as this list."""
+        return self + UnrolledLinkedList(self.chunk_size)
+    
+    def extend(self, other):
+        """Adds all elements, in order, from other --- an Iterable --- to this list."""
+        for x in other:
+            self.append(x)
+
+    def _cut(self, idx):
+        """Splits the node holding index idx (if idx isn't at the start of a
+        node), and returns the node that now starts at idx (or the head
+        sentinel, if idx is len(self))."""
+        if idx >= self.length:
+            return self.head
+        node, off = self._locate(idx)
+        if off > 0:
+            self._split(node, at=off)
+            node = node.next
+        return node
+
+    def _mend(self, node):
+        """Rebalances the nodes on either side of the seam before node (which
+        may be the head sentinel), unless node has already been merged into
+        another node."""
+        if node.prior is None or node.prior.next is not node:
+            return
+        before = node.prior
+        for n in (node, before):
+            if n is not self.head and n.prior is not None and n.prior.next is n:
+                self._rebalance(n)
+
+    def splice(self, other, idx=None):
+        """Moves all elements of other --- another UnrolledLinkedList, which
+        is left empty --- into this list at position idx (by default, at the
+        end). If both lists have the same chunk size, the nodes are relinked
+        rather than copied, so this takes O(chunk_size) time beyond locating
+        idx."""
+        assert(isinstance(other, UnrolledLinkedList))
+        if other is self:
+            raise ValueError('cannot splice a list into itself')
+        if other.length == 0:
+            return
+        if other.chunk_size != self.chunk_size:
+            rehomed = UnrolledLinkedList(self.chunk_size, self.pool_size)
+            rehomed.extend(other)
+            other.clear()
+            other = rehomed
+        node = self._cut(self.length if idx is None else self._normalize_idx(idx))
+        first, last, before = other.head.next, other.head.prior, node.prior
+        before.next, first.prior = first, before
+        last.next, node.prior = node, last
+        self.length += other.length
+        other.clear()
+        self._mend(node)
+        self._mend(first)
+
+    def extend_from(self, other):
+        """Moves all elements of other --- another UnrolledLinkedList, which
+        is left empty --- to the end of this list."""
+        self.splice(other)
+
+    def split_at(self, idx):
+        """Removes the elements from position idx onwards from this list, and
+        returns them (with their original nodes, apart from the one split at
+        idx) as a new list."""
+        nidx = min(self._normalize_idx(idx), self.length)
+        rv = UnrolledLinkedList(self.chunk_size, self.pool_size)
+        if nidx == self.length:
+            return rv
+        first, last = self._cut(nidx), self.head.prior
+        self.head.prior, first.prior.next = first.prior, self.head
+        rv.head.next, first.prior = first, rv.head
+        rv.head.prior, last.next = last, rv.head
+        rv.length = self.length - nidx
+        self.length = nidx
+        self._mend(self.head)
+        rv._rebalance(first)
+        return rv
+
+    def rotate(self, k=1):
+        """Rotates this list k steps to the right (i.e., moves its last k
+        elements to the front), or to the left if k is negative, by relinking
+        its nodes."""
+        if self.length == 0 or k % self.length == 0:
+            return
+        self.splice(self.split_at(self.length - k % self.length), 0)
+
+
+    ### sorting ###
+
+    def _refill(self, vals):
+        """Writes vals --- as many values as this list holds --- into its
+        nodes, in order, keeping the size of every node."""
+        i, n = 0, self.head.next
+        while n is not self.head:
+            k = len(n.vals)
+            n.vals[:] = vals[i:i+k]
+            i += k
+            n = n.next
+
+    def sort(self, key=None, reverse=False):
+        """Sorts this list in place, stably, by sorting its values and writing
+        them back into its nodes, which keep their sizes. Takes O(n log n)
+        time and O(n) extra space; if a comparison raises, the list is left
+        unchanged."""
+        vals = list(self)
+        vals.sort(key=key, reverse=reverse)
+        self._refill(vals)
+
+    def merge(self, other, key=None, reverse=False):
+        """Merges other --- another UnrolledLinkedList, which is left empty ---
+        into this list, in linear time: its nodes are spliced onto the end of
+        this list, and the merged values are written back into all of them.
+        Both lists must be sorted by key (in the order given by reverse);
+        equal elements of this list are placed before those of other."""
+        assert(isinstance(other, UnrolledLinkedList))
+        if other is self:
+            raise ValueError('cannot merge a list into itself')
+        vals = list(heapq.merge(self, other, key=key, reverse=reverse))
+        self.splice(other)
+        self._refill(vals)
+
+
+    ### iteration ###
+
+    def __iter__(self):
+        """Supports iteration (via `iter(self)`)"""
+        n = self.head.next
+        while n is not self.head:
+            yield from n.vals
+            n = n.next
+
+
+# In[ ]:
+
+
+# test unrolled lists
+
+from unittest import TestCase
+import random
+tc = TestCase()
+
+def chunk_sizes(lst):
+    sizes, n = [], lst.head.next
+    while n is not lst.head:
+        sizes.append(len(n.vals))
+        tc.assertIs(n, n.next.prior)
+        n = n.next
+    return sizes
+
+lst = UnrolledLinkedList(chunk_size=8)
+data = []
+for _ in range(2000):
+    op = random.randrange(5)
+    if op == 0 and data:
+        idx = random.randrange(-len(data), len(data))
+        tc.assertEqual(data.pop(idx), lst.pop(idx))
+    elif op == 1 and data:
+        to_rem = data[random.randrange(len(data))]
+        data.remove(to_rem)
+        lst.remove(to_rem)
+    elif op == 2:
+        lst.append(op)
+        data.append(op)
+    else:
+        to_ins = random.randrange(100)
+        idx = random.randrange(-len(data)-2, len(data)+2)
+        data.insert(idx, to_ins)
+        lst.insert(idx, to_ins)
+    sizes = chunk_sizes(lst)
+    tc.assertEqual(len(data), sum(sizes))
+    tc.assertTrue(all(0 < s <= 8 for s in sizes))
+tc.assertEqual(data, [x for x in lst])
+tc.assertEqual(len(data), len(lst))
+
+for i in range(-len(data), len(data)):
+    tc.assertEqual(data[i], lst[i])
+for i in range(len(data)):
+    lst[i] = data[i] = i
+with tc.assertRaises(IndexError):
+    lst[len(data)]
+with tc.assertRaises(ValueError):
+    lst.remove(-1)
+
+# after deleting from the middle, the nodes are at least half full
+lst = UnrolledLinkedList(chunk_size=8)
+lst.extend(range(1000))
+for _ in range(900):
+    del lst[len(lst) // 2]
+tc.assertTrue(all(s >= 4 for s in chunk_sizes(lst)[:-1]))
+
+lst = UnrolledLinkedList()
+data = [random.randrange(1000) for _ in range(1000)]
+lst.extend(data)
+tc.assertEqual(len(data) // 64 + 1, len(chunk_sizes(lst)))
+tc.assertEqual(min(data), lst.min())
+tc.assertEqual(max(data), lst.max())
+for x in data[:100]:
+    tc.assertTrue(x in lst)
+    tc.assertEqual(data.index(x), lst.index(x))
+    tc.assertEqual(data.count(x), lst.count(x))
+tc.assertEqual(data.index(data[500], 300, 700), lst.index(data[500], 300, 700))
+with tc.assertRaises(ValueError):
+    lst.index(1000)
+tc.assertFalse(1000 in lst)
+
+lst2 = lst.copy()
+tc.assertEqual(lst, lst2)
+tc.assertIsNot(lst.head.next, lst2.head.next)
+tc.assertEqual(data + data, [x for x in lst + lst2])
+lst.clear()
+tc.assertEqual(0, len(lst))
+tc.assertEqual('[]', str(lst))
+lst.prepend(2)
+lst.prepend(1)
+tc.assertEqual('[1, 2]', repr(lst))
+
+
+# In[ ]:
+
+
+# test unrolled list cursors, pooling, splicing, splitting and rotation
+
+from unittest import TestCase
+from collections import deque
+import random
+tc = TestCase()
+
+def make(data, chunk_size=8):
+    lst = UnrolledLinkedList(chunk_size)
+    lst.extend(data)
+    return lst
+
+def check(data, lst):
+    sizes = chunk_sizes(lst)
+    tc.assertTrue(all(0 < s <= lst.chunk_size for s in sizes))
+    tc.assertEqual(len(data), sum(sizes))
+    tc.assertEqual(len(data), len(lst))
+    tc.assertEqual(list(data), [x for x in lst])
+    tc.assertEqual(list(data)[::-1], [lst[i] for i in range(-1, -len(data)-1, -1)])
+
+# cursors
+lst = make(range(40))
+data = list(range(40))
+cur = lst.cursor(3)
+tc.assertEqual(3, cur.get())
+for i in range(3, 40):
+    tc.assertEqual(i, cur.get())
+    cur.next()
+tc.assertFalse(cur)
+cur.prev()
+tc.assertEqual(39, cur.get())
+cur.next().next()
+tc.assertEqual(0, cur.get())
+tc.assertFalse(lst.cursor(40))
+
+for _ in range(3000):
+    idx = random.randrange(len(data) + 1)
+    cur = lst.cursor(idx)
+    op = random.randrange(4)
+    if op == 0:
+        cur.insert_before('b')
+        data.insert(idx, 'b')
+        idx += 1
+    elif op == 1:
+        cur.insert_after('a')
+        if idx < len(data):
+            data.insert(idx + 1, 'a')
+        else:
+            data.insert(0, 'a')
+            idx += 1
+    elif op == 2 and cur:
+        tc.assertEqual(data.pop(idx), cur.delete())
+    elif cur:
+        cur.set(random.randrange(100))
+        data[idx] = cur.get()
+    if idx < len(data):
+        tc.assertEqual(data[idx], cur.get())
+    else:
+        tc.assertFalse(cur)
+    check(data, lst)
+with tc.assertRaises(IndexError):
+    lst.cursor(len(lst)).delete()
+
+# pooling
+lst = UnrolledLinkedList(chunk_size=4, pool_size=3)
+lst.extend(range(40))
+for _ in range(40):
+    lst.pop(0)
+tc.assertEqual(3, lst.pool_count)
+node = lst.pool
+lst.extend(range(12))
+tc.assertEqual(0, lst.pool_count)
+check(range(12), lst)
+tc.assertIn(node, [lst._locate(i)[0] for i in range(12)])
+
+# splicing, splitting and rotation
+for _ in range(200):
+    data1 = [random.randrange(100) for _ in range(random.randrange(30))]
+    data2 = [random.randrange(100) for _ in range(random.randrange(30))]
+    idx = random.randrange(-35, 35)
+    lst1 = make(data1)
+    lst2 = make(data2, random.choice([8, 8, 3]))
+    lst1.splice(lst2, idx)
+    nidx = max(0, idx + len(data1)) if idx < 0 else min(idx, len(data1))
+    data1[nidx:nidx] = data2
+    check(data1, lst1)
+    check([], lst2)
+
+    idx = random.randrange(-35, 35)
+    tail = lst1.split_at(idx)
+    check(data1[:idx], lst1)
+    check(data1[idx:], tail)
+    lst1.extend_from(tail)
+    check(data1, lst1)
+
+    k = random.randrange(-40, 40)
+    lst1.rotate(k)
+    data1 = deque(data1)
+    data1.rotate(k)
+    check(data1, lst1)
+
+lst = make(range(10))
+first = lst.head.next
+lst.splice(make(range(10, 16)))
+tc.assertIs(first, lst.head.next)
+with tc.assertRaises(ValueError):
+    lst.splice(lst)
+
+# sorting and merging write the values back into the same nodes
+for n in list(range(10)) + [100, 1337]:
+    for key, reverse in ((None, False), (None, True), (lambda t: t[0], False), (lambda t: t[0], True)):
+        data = [(random.randrange(n // 3 + 1), i) for i in range(n)]
+        lst = make(data)
+        sizes = chunk_sizes(lst)
+        lst.sort(key=key, reverse=reverse)
+        check(sorted(data, key=key, reverse=reverse), lst)
+        tc.assertEqual(sizes, chunk_sizes(lst))
+
+for _ in range(50):
+    data1 = sorted((random.randrange(20), 'a') for _ in range(random.randrange(30)))
+    data2 = sorted((random.randrange(20), 'b') for _ in range(random.randrange(30)))
+    key = lambda t: t[0]
+    lst1, lst2 = make(data1), make(data2, random.choice([8, 3]))
+    lst1.merge(lst2, key=key)
+    check(sorted(data1 + data2, key=key), lst1)
+    check([], lst2)
+    lst1, lst2 = make(data1[::-1]), make(data2[::-1])
+    lst1.merge(lst2, key=key, reverse=True)
+    check(sorted(data1 + data2, key=key, reverse=True), lst1)
+with tc.assertRaises(ValueError):
+    lst1.merge(lst1)
+
+# a failed comparison leaves both lists unchanged
+data = list(range(20)) + ['x']
+lst = make(data)
+with tc.assertRaises(TypeError):
+    lst.sort()
+check(data, lst)
+lst1, lst2 = make(range(10)), make([5, None])
+with tc.assertRaises(TypeError):
+    lst1.merge(lst2)
+check(range(10), lst1)
+check([5, None], lst2)
+
+
+# ### `SkipLinkedList`
+# 
+# Another alternative to `LinkedList` with the same API, for lists that need both positional inserts/deletes and random access. Nodes are linked at level 0 in list order, as usual, but a random subset of them are also linked at higher levels by "express" links that skip over several nodes at once. Each link is annotated with its *width* --- the number of level-0 steps it covers --- so that index `i` can be found by descending through the levels while adding up widths. This makes indexing, `insert`, `pop` and `del` take O(log n) expected time.
+# 
+# `splice`, `split_at` and `rotate` also take O(log n) expected time, as they only relink (and re-annotate) the last node at each level before the seam. As nodes only link forwards, cursors also track their index: moving a cursor forwards takes O(1) time, but moving it backwards or modifying the list through it takes O(log n). Nodes aren't pooled (there's no `pool_size`), since they vary in height. `sort` and `merge` write the sorted (or merged) values back into the existing nodes in order, which leaves every width unchanged.
+
+# In[ ]:
+
+
+import heapq
+import random
+
+class SkipLinkedList:
+    class Node:
+        __slots__ = ('val', 'next', 'width')
+
+        def __init__(self, val, levels):
+            self.val = val
+            self.next = [None] * levels  # successor at each level
+            self.width = [0] * levels    # level-0 steps covered by each link
+
+    class Cursor:
+        """A position in a SkipLinkedList --- either at one of its nodes, or
+        at the head sentinel (which sits between the last and first nodes,
+        at index len(lst)) --- through which the list can be traversed and
+        modified. A cursor is false when it is at the head sentinel.
+
+        Modifying the list other than through a cursor may invalidate it."""
+        def __init__(self, lst, node, idx):
+            self.lst = lst
+            self.node = node
+            self.idx = idx
+
+        def __bool__(self):
+            return self.node is not self.lst.head
+
+        def next(self):
+            """Moves to the next node (wrapping around through the head
+            sentinel), in O(1) time, and returns this cursor."""
+            lst = self.lst
+            if self:
+                self.node, self.idx = self.node.next[0], self.idx + 1
+            else:
+                self.node, self.idx = self.node.next[0], 0
+            if self.node is None:
+                self.node, self.idx = lst.head, lst.length
+            return self
+
+        def prev(self):
+            """Moves to the prior node (wrapping around through the head
+            sentinel), in O(log n) time, and returns this cursor."""
+            lst = self.lst
+            if self and self.idx == 0 or not self and lst.length == 0:
+                self.node, self.idx = lst.head, lst.length
+            else:
+                self.idx -= 1
+                self.node = lst._node_at(self.idx)
+            return self
+
+        def get(self):
+            """Returns the value at this cursor."""
+            if not self:
+                raise IndexError
+            return self.node.val
+
+        def set(self, value):
+            """Replaces the value at this cursor."""
+            if not self:
+                raise IndexError
+            self.node.val = value
+
+        def insert_before(self, value):
+            """Inserts value before this cursor (i.e., at the end of the list,
+            if the cursor is at the head sentinel). The cursor doesn't move."""
+            self.lst._insert(self.idx, value)
+            self.idx += 1
+
+        def insert_after(self, value):
+            """Inserts value after this cursor (i.e., at the front of the list,
+            if the cursor is at the head sentinel). The cursor doesn't move."""
+            if self:
+                self.lst._insert(self.idx + 1, value)
+            else:
+                self.lst._insert(0, value)
+                self.idx += 1
+
+        def delete(self):
+            """Removes and returns the value at this cursor, which moves on to
+            the following node."""
+            if not self:
+                raise IndexError
+            nxt = self.node.next[0]
+            val = self.lst._delete(self.idx)
+            self.node = self.lst.head if nxt is None else nxt
+            return val
+
+    MAX_LEVELS = 32
+
+    def __init__(self):
+        # the head sentinel is at position 0 and the element at index i at
+        # position i+1; links off the end lead to None, at position len+1
+        self.head = SkipLinkedList.Node(None, 1)
+        self.head.width[0] = 1
+        self.length = 0
+
+
+    ### node-level access ###
+
+    def _random_levels(self):
+        levels = 1
+        while levels < SkipLinkedList.MAX_LEVELS and random.random() < 0.5:
+            levels += 1
+        return levels
+
+    def _find(self, pos):
+        """Returns, for each level, the last node at a position before pos,
+        along with the positions of those nodes."""
+        levels = len(self.head.next)
+        chain, steps = [None] * levels, [0] * levels
+        node, p = self.head, 0
+        for lv in range(levels-1, -1, -1):
+            while p + node.width[lv] < pos:
+                p += node.width[lv]
+                node = node.next[lv]
+            chain[lv], steps[lv] = node, p
+        return chain, steps
+
+    def _node_at(self, idx):
+        """Returns the node at index idx, raising IndexError if it is invalid."""
+        if idx < 0:
+            idx += self.length
+            if idx < 0:
+                raise IndexError
+        if idx >= self.length:
+            raise IndexError
+        node, p = self.head, 0
+        for lv in range(len(self.head.next)-1, -1, -1):
+            while p + node.width[lv] <= idx + 1:
+                p += node.width[lv]
+                node = node.next[lv]
+        return node
+
+    def _insert(self, idx, value):
+        """Links a new node holding value in at index 0 <= idx <= len(self)."""
+        levels = self._random_levels()
+        self._add_levels(levels)
+        chain, steps = self._find(idx + 1)
+        n = SkipLinkedList.Node(value, levels)
+        for lv in range(levels):
+            prev = chain[lv]
+            n.next[lv], prev.next[lv] = prev.next[lv], n
+            n.width[lv] = prev.width[lv] - (idx - steps[lv])
+            prev.width[lv] = idx + 1 - steps[lv]
+        for lv in range(levels, len(chain)):
+            chain[lv].width[lv] += 1
+        self.length += 1
+
+    def _delete(self, idx):
+        """Unlinks the node at index 0 <= idx < len(self), and returns its value."""
+        chain, _ = self._find(idx + 1)
+        n = chain[0].next[0]
+        for lv in range(len(chain)):
+            prev = chain[lv]
+            if prev.next[lv] is n:
+                prev.width[lv] += n.width[lv] - 1
+                prev.next[lv] = n.next[lv]
+            else:
+                prev.width[lv] -= 1
+        self.length -= 1
+        return n.val
+
+    def _add_levels(self, levels):
+        """Gives the head sentinel (at least) the given number of levels."""
+        head = self.head
+        while len(head.next) < levels:
+            head.next.append(None)
+            head.width.append(self.length + 1)
+
+    def _concat(self, other):
+        """Moves all of other's nodes to the end of this list, by linking the
+        last node at each level to other's first one, in O(log n) time."""
+        levels = max(len(self.head.next), len(other.head.next))
+        self._add_levels(levels)
+        other._add_levels(levels)
+        chain, steps = self._find(self.length + 1)
+        for lv in range(levels):
+            prev = chain[lv]
+            prev.next[lv] = other.head.next[lv]
+            prev.width[lv] = self.length - steps[lv] + other.head.width[lv]
+        self.length += other.length
+        other.clear()
+
+    def cursor(self, idx=0):
+        """Returns a Cursor at index idx (or at the head sentinel, if idx is
+        len(self))."""
+        if self._normalize_idx(idx) == self.length:
+            return SkipLinkedList.Cursor(self, self.head, self.length)
+        node = self._node_at(idx)
+        return SkipLinkedList.Cursor(self, node, idx + self.length if idx < 0 else idx)
+            
+            
+    ### subscript-based access ###
+    
+    def _normalize_idx(self, idx):
+        nidx = idx
+        if nidx < 0:
+            nidx += len(self)
+            if nidx < 0:
+                nidx = 0
+        return nidx
+    
+    def __getitem__(self, idx):
+        """Implements `x = self[idx]`"""
+        assert(isinstance(idx, int))
+        return self._node_at(idx).val
+
+    def __setitem__(self, idx, value):
+        """Implements `self[idx] = x`"""
+        assert(isinstance(idx, int))
+        self._node_at(idx).val = value
+
+    def __delitem__(self, idx):
+        """Implements `del self[idx]`"""
+        assert(isinstance(idx, int))
+        self.pop(idx)
+    
+
+    ### stringification ###
+    
+    def __str__(self):
+        """Implements `str(self)`. Returns '[]' if the list is empty, else
+        returns `str(x)` for all values `x` in this list, separated by commas
+        and enclosed by square brackets. E.g., for a list containing values
+        1, 2 and 3, returns '[1, 2, 3]'."""
+        return self.__repr__()
+
+    def __repr__(self):
+        """Supports REPL inspection. (Same behavior as `str`.)"""
+        return '[' + ', '.join(str(x) for x in self) + ']'
+
+
+    ### single-element manipulation ###
+
+    def prepend(self, value):
+        self._insert(0, value)
+        
+    def append(self, value):
+        self._insert(self.length, value)
+        
+    def insert(self, idx, value):
+        """Inserts value at position idx, shifting the original elements down the
+        list, as needed. Note that inserting a value at len(self) --- equivalent
+        to appending the value --- is permitted. Raises IndexError if idx is invalid."""
+        assert(isinstance(idx, int))
+        self._insert(min(self._normalize_idx(idx), self.length), value)
+    
+    def pop(self, idx=-1):
+        """Deletes and returns the element at idx (which is the last element,
+        by default)."""
+        if idx < 0:
+            idx += self.length
+            if idx < 0:
+                raise IndexError
+        if idx >= self.length:
+            raise IndexError
+        return self._delete(idx)
+    
+    def remove(self, value):
+        """Removes the first (closest to the front) instance of value from the
+        list. Raises a ValueError if value is not found in the list."""
+        self._delete(self.index(value))
+
+
+    ### predicates (T/F queries) ###
+    
+    def __eq__(self, other):
+        """Returns True if this SkipLinkedList contains the same elements (in
+        order) as other. If other is not a SkipLinkedList, returns False."""
+        if not isinstance(other, SkipLinkedList) or len(other) != len(self):
+            return False
+        for x, y in zip(self, other):
+            if x != y:
+                return False
+        return True
+
+    def __contains__(self, value):
+        """Implements `val in self`. Returns true if value is found in this list."""
+        for x in self:
+            if x == value:
+                return True
+        return False
+
+
+    ### queries ###
+    
+    def __len__(self):
+        """Implements `len(self)`"""
+        return self.length
+    
+    def min(self):
+        """Returns the minimum value in this list."""
+        if self.length == 0:
+            raise ValueError('min() of empty list')
+        return min(self)
+    
+    def max(self):
+        """Returns the maximum value in this list."""
+        if self.length == 0:
+            raise ValueError('max() of empty list')
+        return max(self)
+    
+    def index(self, value, i=0, j=None):
+        """Returns the index of the first instance of value encountered in
+        this list between index i (inclusive) and j (exclusive). If j is not
+        specified, search through the end of the list for value. If value
+        is not in the list, raise a ValueError."""
+        i = self._normalize_idx(i)
+        j = self.length if j is None else min(self._normalize_idx(j), self.length)
+        if i < j:
+            n = self._node_at(i)
+            for idx in range(i, j):
+                if n.val == value:
+                    return idx
+                n = n.next[0]
+        raise ValueError
+    
+    def count(self, value):
+        """Returns the number of times value appears in this list."""
+        count = 0
+        for x in self:
+            if x == value:
+                count += 1
+        return count
+
+
+    ### bulk operations ###
+
+    def __add__(self, other):
+        """Implements `self + other_list`. Returns a new SkipLinkedList
+        instance that contains the values in this list followed by those 
+        of other."""
+        assert(isinstance(other, SkipLinkedList))
+        rv = SkipLinkedList()
+        rv.extend(self)
+        rv.extend(other)
+        return rv
+    
+    def clear(self):
+        """Removes all elements from this list."""
+        self.head = SkipLinkedList.Node(None, 1)
+        self.head.width[0] = 1
+        self.length = 0
+        
+    def copy(self):
+        """Returns a new SkipLinkedList instance (with separate Nodes), that
+        contains the same values as this list."""
+        return self + SkipLinkedList()
+    
+    def extend(self, other):
+        """Adds all elements, in order, from other --- an Iterable --- to this list."""
+        for x in other:
+            self.append(x)
+
+    def splice(self, other, idx=None):
+        """Moves all elements of other --- another SkipLinkedList, which is
+        left empty --- into this list at position idx (by default, at the
+        end), by relinking its nodes in O(log n) time."""
+        assert(isinstance(other, SkipLinkedList))
+        if other is self:
+            raise ValueError('cannot splice a list into itself')
+        if idx is None or self._normalize_idx(idx) >= self.length:
+            self._concat(other)
+        else:
+            tail = self.split_at(idx)
+            self._concat(other)
+            self._concat(tail)
+
+    def extend_from(self, other):
+        """Moves all elements of other --- another SkipLinkedList, which is
+        left empty --- to the end of this list, in O(log n) time."""
+        self.splice(other)
+
+    def split_at(self, idx):
+        """Removes the elements from position idx onwards from this list, and
+        returns them (with their original nodes) as a new list, in O(log n)
+        time."""
+        nidx = min(self._normalize_idx(idx), self.length)
+        rv = SkipLinkedList()
+        if nidx == self.length:
+            return rv
+        levels = len(self.head.next)
+        rv._add_levels(levels)
+        chain, steps = self._find(nidx + 1)
+        for lv in range(levels):
+            prev = chain[lv]
+            rv.head.next[lv] = prev.next[lv]
+            rv.head.width[lv] = steps[lv] + prev.width[lv] - nidx
+            prev.next[lv] = None
+            prev.width[lv] = nidx + 1 - steps[lv]
+        rv.length = self.length - nidx
+        self.length = nidx
+        return rv
+
+    def rotate(self, k=1):
+        """Rotates this list k steps to the right (i.e., moves its last k
+        elements to the front), or to the left if k is negative, in O(log n)
+        time."""
+        if self.length == 0 or k % self.length == 0:
+            return
+        tail = self.split_at(self.length - k % self.length)
+        tail._concat(self)
+        self._concat(tail)
+
+
+    ### sorting ###
+
+    def _refill(self, vals):
+        """Writes vals --- as many values as this list holds --- into its
+        nodes, in order. As no node moves, the express links and their
+        widths stay valid."""
+        n = self.head.next[0]
+        for x in vals:
+            n.val = x
+            n = n.next[0]
+
+    def sort(self, key=None, reverse=False):
+        """Sorts this list in place, stably, by sorting its values and writing
+        them back into its nodes. Takes O(n log n) time and O(n) extra space;
+        if a comparison raises, the list is left unchanged."""
+        vals = list(self)
+        vals.sort(key=key, reverse=reverse)
+        self._refill(vals)
+
+    def merge(self, other, key=None, reverse=False):
+        """Merges other --- another SkipLinkedList, which is left empty ---
+        into this list, in linear time: its nodes are spliced onto the end of
+        this list, and the merged values are written back into all of them.
+        Both lists must be sorted by key (in the order given by reverse);
+        equal elements of this list are placed before those of other."""
+        assert(isinstance(other, SkipLinkedList))
+        if other is self:
+            raise ValueError('cannot merge a list into itself')
+        vals = list(heapq.merge(self, other, key=key, reverse=reverse))
+        self._concat(other)
+        self._refill(vals)
+
+
+    ### iteration ###
+
+    def __iter__(self):
+        """Supports iteration (via `iter(self)`)"""
+        n = self.head.next[0]
+        while n is not None:
+            yield n.val
+            n = n.next[0]
+
+
+# In[ ]:
+
+
+# test skip lists
+
+from unittest import TestCase
+import random
+tc = TestCase()
+
+def check_widths(lst):
+    """Checks that every link's width matches the positions it connects."""
+    pos, n = {id(lst.head): 0}, lst.head.next[0]
+    i = 1
+    while n is not None:
+        pos[id(n)] = i
+        n, i = n.next[0], i + 1
+    n = lst.head
+    while n is not None:
+        for lv in range(len(n.next)):
+            end = lst.length + 1 if n.next[lv] is None else pos[id(n.next[lv])]
+            tc.assertEqual(end - pos[id(n)], n.width[lv])
+        n = n.next[0]
+
+lst = SkipLinkedList()
+data = []
+for _ in range(2000):
+    op = random.randrange(5)
+    if op == 0 and data:
+        idx = random.randrange(-len(data), len(data))
+        tc.assertEqual(data.pop(idx), lst.pop(idx))
+    elif op == 1 and data:
+        to_rem = data[random.randrange(len(data))]
+        data.remove(to_rem)
+        lst.remove(to_rem)
+    else:
+        to_ins = random.randrange(100)
+        idx = random.randrange(-len(data)-2, len(data)+2)
+        data.insert(idx, to_ins)
+        lst.insert(idx, to_ins)
+check_widths(lst)
+tc.assertEqual(data, [x for x in lst])
+tc.assertEqual(len(data), len(lst))
+
+for i in range(-len(data), len(data)):
+    tc.assertEqual(data[i], lst[i])
+for i in range(len(data)):
+    lst[i] = data[i] = random.randrange(100)
+tc.assertEqual(data, [x for x in lst])
+for i in (len(data), -len(data)-1):
+    with tc.assertRaises(IndexError):
+        lst[i]
+    with tc.assertRaises(IndexError):
+        del lst[i]
+with tc.assertRaises(ValueError):
+    lst.remove(100)
+
+tc.assertEqual(min(data), lst.min())
+tc.assertEqual(max(data), lst.max())
+for x in data[:50]:
+    tc.assertTrue(x in lst)
+    tc.assertEqual(data.index(x), lst.index(x))
+    tc.assertEqual(data.count(x), lst.count(x))
+tc.assertEqual(data + data, [x for x in lst + lst.copy()])
+tc.assertEqual(lst, lst.copy())
+
+# random access into a large list
+lst = SkipLinkedList()
+lst.extend(range(100000))
+for i in random.sample(range(100000), 1000):
+    tc.assertEqual(i, lst[i])
+lst.clear()
+tc.assertEqual('[]', str(lst))
+
+
+# In[ ]:
+
+
+# test skip list cursors, splicing, splitting and rotation
+
+from unittest import TestCase
+from collections import deque
+import random
+tc = TestCase()
+
+def make(data):
+    lst = SkipLinkedList()
+    lst.extend(data)
+    return lst
+
+def check(data, lst):
+    check_widths(lst)
+    tc.assertEqual(len(data), len(lst))
+    tc.assertEqual(list(data), [x for x in lst])
+    for i in range(len(data)):
+        tc.assertEqual(data[i], lst[i])
+
+# cursors
+lst = make(range(20))
+cur = lst.cursor(-3)
+tc.assertEqual(17, cur.get())
+cur.next().next().next()
+tc.assertFalse(cur)
+tc.assertEqual(0, cur.next().get())
+tc.assertFalse(cur.prev())
+tc.assertEqual(19, cur.prev().get())
+
+data = list(range(20))
+for _ in range(1000):
+    idx = random.randrange(len(data) + 1)
+    cur = lst.cursor(idx)
+    op = random.randrange(4)
+    if op == 0:
+        cur.insert_before('b')
+        data.insert(idx, 'b')
+        idx += 1
+    elif op == 1:
+        cur.insert_after('a')
+        if idx < len(data):
+            data.insert(idx + 1, 'a')
+        else:
+            data.insert(0, 'a')
+            idx += 1
+    elif op == 2 and cur:
+        tc.assertEqual(data.pop(idx), cur.delete())
+    elif cur:
+        cur.set(random.randrange(100))
+        data[idx] = cur.get()
+    if idx < len(data):
+        tc.assertEqual(data[idx], cur.get())
+        if idx > 0:
+            tc.assertEqual(data[idx-1], cur.prev().get())
+    else:
+        tc.assertFalse(cur)
+check(data, lst)
+with tc.assertRaises(IndexError):
+    lst.cursor(len(lst)).delete()
+
+# splicing, splitting and rotation
+for _ in range(200):
+    data1 = [random.randrange(100) for _ in range(random.randrange(30))]
+    data2 = [random.randrange(100) for _ in range(random.randrange(30))]
+    idx = random.randrange(-35, 35)
+    lst1, lst2 = make(data1), make(data2)
+    lst1.splice(lst2, idx)
+    nidx = max(0, idx + len(data1)) if idx < 0 else min(idx, len(data1))
+    data1[nidx:nidx] = data2
+    check(data1, lst1)
+    check([], lst2)
+
+    idx = random.randrange(-35, 35)
+    tail = lst1.split_at(idx)
+    check(data1[:idx], lst1)
+    check(data1[idx:], tail)
+    lst1.extend_from(tail)
+    check(data1, lst1)
+
+    k = random.randrange(-40, 40)
+    lst1.rotate(k)
+    data1 = deque(data1)
+    data1.rotate(k)
+    check(list(data1), lst1)
+
+lst = make(range(10))
+node = lst._node_at(5)
+tail = lst.split_at(5)
+tc.assertIs(node, tail.head.next[0])
+with tc.assertRaises(ValueError):
+    lst.splice(lst)
+
+# sorting and merging write the values back into the same nodes
+for n in list(range(10)) + [100, 1337]:
+    for key, reverse in ((None, False), (None, True), (lambda t: t[0], False), (lambda t: t[0], True)):
+        data = [(random.randrange(n // 3 + 1), i) for i in range(n)]
+        lst = make(data)
+        nodes = [lst._node_at(i) for i in range(n)]
+        lst.sort(key=key, reverse=reverse)
+        check(sorted(data, key=key, reverse=reverse), lst)
+        tc.assertEqual(list(map(id, nodes)), [id(lst._node_at(i)) for i in range(n)])
+
+for _ in range(50):
+    data1 = sorted((random.randrange(20), 'a') for _ in range(random.randrange(30)))
+    data2 = sorted((random.randrange(20), 'b') for _ in range(random.randrange(30)))
+    key = lambda t: t[0]
+    lst1, lst2 = make(data1), make(data2)
+    lst1.merge(lst2, key=key)
+    check(sorted(data1 + data2, key=key), lst1)
+    check([], lst2)
+    lst1, lst2 = make(data1[::-1]), make(data2[::-1])
+    lst1.merge(lst2, key=key, reverse=True)
+    check(sorted(data1 + data2, key=key, reverse=True), lst1)
+with tc.assertRaises(ValueError):
+    lst1.merge(lst1)
+
+# a failed comparison leaves both lists unchanged
+data = list(range(20)) + ['x']
+lst = make(data)
+with tc.assertRaises(TypeError):
+    lst.sort()
+check(data, lst)
+lst1, lst2 = make(range(10)), make([5, None])
+with tc.assertRaises(TypeError):
+    lst1.merge(lst2)
+check(range(10), lst1)
+check([5, None], lst2)
+
+
+# ### `ConcurrentDeque`
+# 
+# A `LinkedList` that can be shared between threads and used as a double-ended queue via `push_left`/`push_right` and `pop_left`/`pop_right` (`prepend` and `append` are also safe to use). The two ends are guarded by separate locks (as in the two-lock queue of Michael & Scott), so a producer at one end doesn't block a consumer at the other: while the deque holds enough elements, an operation at one end never touches the pointers used at the other. When the deque is nearly empty (or nearly full, if it was given a `maxsize`), operations take both locks instead. Pops block while the deque is empty, and pushes while it is full, optionally up to a timeout.
+# 
+# The remaining `LinkedList` methods are *not* synchronized, and should only be used while no other thread is accessing the deque.
+
+# In[ ]:
+
+
+import threading
+from time import monotonic
+
+class ConcurrentDeque(LinkedList):
+    # fewest elements for which operations at opposite ends are guaranteed not
+    # to touch the same pointers, allowing for a concurrent pop at the other
+    # end that hasn't been counted yet
+    MIN_UNSHARED = 4
+
+    def __init__(self, maxsize=0):
+        """Creates an empty deque, which holds at most maxsize elements (or any
+        number of elements, if maxsize is 0)."""
+        self.head_count = 0 # net elements added at the front (under head_lock)
+        self.tail_count = 0 # net elements added at the back (under tail_lock)
+        super().__init__() # no node pool: it would be shared by both ends
+        self.maxsize = maxsize
+        self.head_lock = threading.Lock()
+        self.tail_lock = threading.Lock()
+        waiting_lock = threading.Lock()
+        self.not_empty = threading.Condition(waiting_lock)
+        self.not_full = threading.Condition(waiting_lock)
+        self.empty_waiters = 0
+        self.full_waiters = 0
+
+    @property
+    def length(self):
+        return self.head_count + self.tail_count
+
+    @length.setter
+    def length(self, n):
+        # only used by the unsynchronized LinkedList methods
+        self.tail_count = n - self.head_count
+
+
+    ### locking ###
+
+    def _acquire(self, front, push, block, timeout):
+        """Acquires the lock(s) needed to push or pop at one end, waiting (if
+        block is True) while the deque is full or empty, respectively. Returns
+        the locks acquired."""
+        deadline = None if timeout is None else monotonic() + timeout
+        own = self.head_lock if front else self.tail_lock
+        while True:
+            own.acquire()
+            n = self.length
+            if n >= ConcurrentDeque.MIN_UNSHARED and not (push and self.maxsize and n >= self.maxsize - 1):
+                return (own,)
+            own.release()
+            self.head_lock.acquire()
+            self.tail_lock.acquire()
+            n = self.length
+            if (not self.maxsize or n < self.maxsize) if push else n > 0:
+                return (self.head_lock, self.tail_lock)
+            remaining = None if deadline is None else deadline - monotonic()
+            if not block or (remaining is not None and remaining <= 0):
+                self.tail_lock.release()
+                self.head_lock.release()
+                if push:
+                    raise RuntimeError('deque is full')
+                raise IndexError('pop from empty deque')
+            # register as a waiter before letting go of the deque, so that the
+            # next push (or pop) is sure to notify us
+            cond = self.not_full if push else self.not_empty
+            with cond:
+                if push:
+                    self.full_waiters += 1
+                else:
+                    self.empty_waiters += 1
+                self.tail_lock.release()
+                self.head_lock.release()
+                cond.wait(remaining)
+                if push:
+                    self.full_waiters -= 1
+                else:
+                    self.empty_waiters -= 1
+
+    @staticmethod
+    def _release(locks):
+        for lock in reversed(locks):
+            lock.release()
+
+
+    ### deque operations ###
+
+    def push_left(self, value, block=True, timeout=None):
+        """Adds value to the front of the deque. If the deque is full, waits
+        for room (for up to timeout seconds, if given) if block is True, and
+        otherwise raises a RuntimeError."""
+        locks = self._acquire(True, True, block, timeout)
+        try:
+            n = LinkedList.Node(value, prior=self.head, next=self.head.next)
+            self.head.next.prior = self.head.next = n
+            self.head_count += 1
+        finally:
+            self._release(locks)
+        if self.empty_waiters:
+            with self.not_empty:
+                self.not_empty.notify()
+
+    def push_right(self, value, block=True, timeout=None):
+        """Adds value to the back of the deque. (See `push_left`.)"""
+        locks = self._acquire(False, True, block, timeout)
+        try:
+            n = LinkedList.Node(value, prior=self.head.prior, next=self.head)
+            n.prior.next = n.next.prior = n
+            self.tail_count += 1
+        finally:
+            self._release(locks)
+        if self.empty_waiters:
+            with self.not_empty:
+                self.not_empty.notify()
+
+    def pop_left(self, block=True, timeout=None):
+        """Removes and returns the value at the front of the deque. If the deque
+        is empty, waits for a value (for up to timeout seconds, if given) if
+        block is True, and otherwise raises an IndexError."""
+        locks = self._acquire(True, False, block, timeout)
+        try:
+            n = self.head.next
+            self.head.next = n.next
+            n.next.prior = self.head
+            self.head_count -= 1
+        finally:
+            self._release(locks)
+        if self.full_waiters:
+            with self.not_full:
+                self.not_full.notify()
+        return n.val
+
+    def pop_right(self, block=True, timeout=None):
+        """Removes and returns the value at the back of the deque. (See
+        `pop_left`.)"""
+        locks = self._acquire(False, False, block, timeout)
+        try:
+            n = self.head.prior
+            self.head.prior = n.prior
+            n.prior.next = self.head
+            self.tail_count -= 1
+        finally:
+            self._release(locks)
+        if self.full_waiters:
+            with self.not_full:
+                self.not_full.notify()
+        return n.val
+
+    def prepend(self, value):
+        self.push_left(value)
+
+    def append(self, value):
+        self.push_right(value)
+
+    def _new_list(self):
+        # unbounded, as `self + other` may hold more than maxsize elements (and
+        # would block forever filling a bounded deque)
+        return ConcurrentDeque()
+
+    def copy(self):
+        rv = super().copy()
+        rv.maxsize = self.maxsize
+        return rv
+
+
+# In[ ]:
+
+
+# test concurrent deques
+
+from unittest import TestCase
+import threading
+tc = TestCase()
+
+dq = ConcurrentDeque()
+for i in range(10):
+    dq.push_right(i)
+    dq.push_left(-i)
+tc.assertEqual(20, len(dq))
+tc.assertEqual(list(range(-9, 1)) + list(range(10)), [x for x in dq])
+tc.assertEqual(-9, dq.pop_left())
+tc.assertEqual(9, dq.pop_right())
+while dq:
+    dq.pop_right()
+with tc.assertRaises(IndexError):
+    dq.pop_left(block=False)
+with tc.assertRaises(IndexError):
+    dq.pop_right(timeout=0.01)
+
+# producers and consumers at both ends
+dq = ConcurrentDeque(maxsize=50)
+n_items, n_threads = 5000, 4
+consumed = [[] for _ in range(n_threads)]
+
+def produce(t):
+    for i in range(t, n_items, n_threads):
+        (dq.push_left if i % 2 else dq.push_right)(i)
+
+def consume(t):
+    for i in range(t, n_items, n_threads):
+        consumed[t].append(dq.pop_left() if i % 3 else dq.pop_right())
+
+threads = [threading.Thread(target=produce, args=(t,)) for t in range(n_threads)]
+threads += [threading.Thread(target=consume, args=(t,)) for t in range(n_threads)]
+for t in threads:
+    t.start()
+for t in threads:
+    t.join(timeout=30)
+tc.assertFalse(any(t.is_alive() for t in threads))
+tc.assertEqual(list(range(n_items)), sorted(x for c in consumed for x in c))
+tc.assertEqual(0, len(dq))
+tc.assertIs(dq.head, dq.head.next)
+tc.assertIs(dq.head, dq.head.prior)
+
+# bounded deques block producers while full
+dq = ConcurrentDeque(maxsize=2)
+dq.append(1)
+dq.prepend(0)
+with tc.assertRaises(RuntimeError):
+    dq.push_right(2, block=False)
+with tc.assertRaises(RuntimeError):
+    dq.push_left(2, timeout=0.01)
+
+t = threading.Thread(target=dq.push_right, args=(2,))
+t.start()
+t.join(timeout=0.05)
+tc.assertTrue(t.is_alive())
+tc.assertEqual(0, dq.pop_left())
+t.join(timeout=5)
+tc.assertFalse(t.is_alive())
+tc.assertEqual([1, 2], [x for x in dq])
+
+# concatenating full deques doesn't block
+t = threading.Thread(target=lambda: dq + dq, daemon=True)
+t.start()
+t.join(timeout=5)
+tc.assertFalse(t.is_alive())
+tc.assertEqual([1, 2, 1, 2], [x for x in dq + dq])
+tc.assertEqual(2, dq.copy().maxsize)
+tc.assertEqual([1, 2], [x for x in dq.copy()])
+
+
+# ### `SelfOrganizingList`
+# 
+# A `LinkedList` for lookup-heavy workloads with skewed access patterns (e.g., small symbol tables), in which every successful search via `in` moves the node found towards the front of the list, by relinking it in O(1) time, so that frequently accessed values end up near the front. Three policies are supported:
+# 
+# - `'move-to-front'`: the node found is moved to the front of the list
+# - `'transpose'`: the node found is swapped with the one before it
+# - `'count'`: each node counts how often it has been found, and the node found is moved in front of all nodes with lower counts
+# 
+# Note that `index` doesn't reorganize the list, as that would invalidate the index it returns.
+
+# In[ ]:
+
+
+class SelfOrganizingList(LinkedList):
+    class Node(LinkedList.Node):
+        __slots__ = ('count',)
+
+        def __init__(self, val, prior=None, next=None):
+            super().__init__(val, prior, next)
+            self.count = 0
+
+    POLICIES = ('move-to-front', 'transpose', 'count')
+
+    def __init__(self, policy='move-to-front', pool_size=0):
+        if policy not in SelfOrganizingList.POLICIES:
+            raise ValueError('unknown policy: ' + repr(policy))
+        super().__init__(pool_size)
+        self.policy = policy
+
+    def _new_list(self):
+        return SelfOrganizingList(self.policy, self.pool_size)
+
+    def _insert_before(self, node, value):
+        n = super()._insert_before(node, value)
+        n.count = 0 # reset, in case the node came from the pool
+        return n
+
+    def _splice_before(self, node, other):
+        """Nodes from other kinds of lists have no count, so their values are
+        moved into new nodes (in O(k) time) rather than relinked."""
+        if not isinstance(other, SelfOrganizingList):
+            if other is self:
+                raise ValueError('cannot splice a list into itself')
+            rehomed = self._new_list()
+            for x in other:
+                rehomed.append(x)
+            other.clear()
+            other = rehomed
+        super()._splice_before(node, other)
+
+    def _move_before(self, node, target):
+        """Relinks node (which must not be target) in before target."""
+        node.prior.next = node.next
+        node.next.prior = node.prior
+        node.prior, node.next = target.prior, target
+        target.prior.next = target.prior = node
+
+    def _found(self, node):
+        """Reorganizes the list after a successful search for node."""
+        if self.policy == 'move-to-front':
+            if node.prior is not self.head:
+                self._move_before(node, self.head.next)
+        elif self.policy == 'transpose':
+            if node.prior is not self.head:
+                self._move_before(node, node.prior)
+        else:
+            node.count += 1
+            target = node
+            while target.prior is not self.head and target.prior.count < node.count:
+                target = target.prior
+            if target is not node:
+                self._move_before(node, target)
+
+    def __contains__(self, value):
+        """Implements `val in self`. Returns true if value is found in this list,
+        and moves the node found towards the front according to the policy."""
+        n = self.head.next
+        while n is not self.head:
+            if n.val == value:
+                self._found(n)
+                return True
+            n = n.next
+        return False
+
+
+# In[ ]:
+
+
+# test self-organizing lists
+
+from unittest import TestCase
+tc = TestCase()
+
+def make(policy, data):
+    lst = SelfOrganizingList(policy)
+    lst.extend(data)
+    return lst
+
+lst = make('move-to-front', range(10))
+tc.assertTrue(5 in lst)
+tc.assertTrue(8 in lst)
+tc.assertFalse(10 in lst)
+tc.assertEqual([8, 5, 0, 1, 2, 3, 4, 6, 7, 9], [x for x in lst])
+tc.assertEqual([9, 7, 6, 4, 3, 2, 1, 0, 5, 8], [lst[i] for i in range(-1, -11, -1)])
+tc.assertEqual(3, lst.index(1))
+tc.assertEqual([8, 5, 0, 1, 2, 3, 4, 6, 7, 9], [x for x in lst])
+
+lst = make('transpose', range(5))
+tc.assertTrue(3 in lst)
+tc.assertTrue(3 in lst)
+tc.assertTrue(0 in lst)
+tc.assertTrue(3 in lst)
+tc.assertEqual([3, 0, 1, 2, 4], [x for x in lst])
+tc.assertEqual([4, 2, 1, 0, 3], [lst[i] for i in range(-1, -6, -1)])
+
+lst = make('count', 'abcde')
+for x in 'edcedde':
+    tc.assertTrue(x in lst)
+tc.assertEqual(['d', 'e', 'c', 'a', 'b'], [x for x in lst])
+tc.assertEqual(['b', 'a', 'c', 'e', 'd'], [lst[i] for i in range(-1, -6, -1)])
+lst.append('f')
+tc.assertTrue('f' in lst)
+tc.assertEqual(['d', 'e', 'c', 'f', 'a', 'b'], [x for x in lst])
+lst.remove('c')
+tc.assertEqual(5, len(lst))
+
+tc.assertIsInstance(lst.copy(), SelfOrganizingList)
+with tc.assertRaises(ValueError):
+    SelfOrganizingList('random')
+
+# nodes from plain lists are given counts when spliced or merged in
+def plain(data):
+    lst = LinkedList()
+    lst.extend(data)
+    return lst
+
+lst = make('count', 'ab')
+lst.splice(plain('xy'), 1)
+lst.extend_from(plain('z'))
+lst.merge(plain('c'))
+tc.assertEqual(['a', 'c', 'x', 'y', 'b', 'z'], [x for x in lst])
+for x in 'zzyc':
+    tc.assertTrue(x in lst)
+tc.assertEqual(['z', 'y', 'c', 'a', 'x', 'b'], [x for x in lst])
+tc.assertEqual(['b', 'x', 'a', 'c', 'y', 'z'], [lst[i] for i in range(-1, -7, -1)])
+donor = plain('q')
+lst.splice(donor)
+tc.assertEqual(0, len(donor))
+tc.assertEqual([], [x for x in donor])
+with tc.assertRaises(ValueError):
+    lst.splice(lst)
+
+
+# ### `IndexedLinkedList`
+# 
+# A `LinkedList` that also maintains a hash index from each value to the nodes holding it, so that `in`, `count` and `remove` take O(1) average time instead of scanning the list (`remove` still has to walk the list to find the first of several nodes holding equal values). Ordering and duplicates are preserved as usual, but all values must be hashable.
+
+# In[ ]:
+
+
+class IndexedLinkedList(LinkedList):
+    def __init__(self, pool_size=0):
+        super().__init__(pool_size)
+        self.nodes = {} # value -> the nodes holding it (as the keys of a dict)
+
+    def _new_list(self):
+        return IndexedLinkedList(self.pool_size)
+
+    def _insert_before(self, node, value):
+        nodes = self.nodes.setdefault(value, {})
+        n = super()._insert_before(node, value)
+        nodes[n] = None
+        return n
+
+    def _forget(self, node):
+        """Removes node from the index."""
+        nodes = self.nodes[node.val]
+        del nodes[node]
+        if not nodes:
+            del self.nodes[node.val]
+
+    def _unlink(self, node):
+        self._forget(node)
+        return super()._unlink(node)
+
+    def _set_val(self, node, value):
+        hash(value) # fail before touching the index if value is unhashable
+        self._forget(node)
+        node.val = value
+        self.nodes.setdefault(value, {})[node] = None
+
+    def _splice_before(self, node, other):
+        if other is self:
+            raise ValueError('cannot splice a list into itself')
+        # index the nodes before moving them, so that an unhashable value
+        # leaves both lists as they were
+        n = other.head.next
+        try:
+            while n is not other.head:
+                self.nodes.setdefault(n.val, {})[n] = None
+                n = n.next
+        except TypeError:
+            m = other.head.next
+            while m is not n:
+                self._forget(m)
+                m = m.next
+            raise
+        super()._splice_before(node, other)
+
+    def split_at(self, idx):
+        rv = super().split_at(idx)
+        for n in self._nodes(rv):
+            self._forget(n)
+            rv.nodes.setdefault(n.val, {})[n] = None
+        return rv
+
+    @staticmethod
+    def _nodes(lst):
+        n = lst.head.next
+        while n is not lst.head:
+            yield n
+            n = n.next
+
+    def clear(self):
+        super().clear()
+        self.nodes = {}
+
+    ### index-backed queries ###
+
+    def __contains__(self, value):
+        try:
+            return value in self.nodes
+        except TypeError: # unhashable, so can't be in the list
+            return False
+
+    def count(self, value):
+        try:
+            return len(self.nodes.get(value, ()))
+        except TypeError:
+            return 0
+
+    def index(self, value, i=0, j=None):
+        if value not in self:
+            raise ValueError
+        return super().index(value, i, j)
+
+    def remove(self, value):
+        if value not in self:
+            raise ValueError
+        nodes = self.nodes[value]
+        if len(nodes) == 1:
+            node = next(iter(nodes))
+        else:
+            node = self.head.next
+            while node not in nodes:
+                node = node.next
+        self._unlink(node)
+
+
+# In[ ]:
+
+
+# test indexed lists
+
+from unittest import TestCase
+import random
+tc = TestCase()
+
+def check_index(lst):
+    expected = {}
+    for n in IndexedLinkedList._nodes(lst):
+        expected.setdefault(n.val, {})[n] = None
+    tc.assertEqual(expected, lst.nodes)
+
+lst = IndexedLinkedList(pool_size=5)
+data = []
+for _ in range(2000):
+    op = random.randrange(6)
+    if op == 0 and data:
+        idx = random.randrange(-len(data), len(data))
+        tc.assertEqual(data.pop(idx), lst.pop(idx))
+    elif op == 1 and data:
+        to_rem = data[random.randrange(len(data))]
+        data.remove(to_rem)
+        lst.remove(to_rem)
+    elif op == 2 and data:
+        idx = random.randrange(len(data))
+        lst[idx] = data[idx] = random.randrange(50)
+    else:
+        to_ins = random.randrange(50)
+        idx = random.randrange(len(data)+1)
+        data.insert(idx, to_ins)
+        lst.insert(idx, to_ins)
+tc.assertEqual(data, [x for x in lst])
+check_index(lst)
+for x in range(-1, 51):
+    tc.assertEqual(x in data, x in lst)
+    tc.assertEqual(data.count(x), lst.count(x))
+    if x in data:
+        tc.assertEqual(data.index(x), lst.index(x))
+with tc.assertRaises(ValueError):
+    lst.remove(50)
+with tc.assertRaises(ValueError):
+    lst.index(50)
+tc.assertFalse([1] in lst)
+
+cur = lst.cursor(3)
+cur.set('x')
+cur.insert_after('y')
+cur.next().delete()
+check_index(lst)
+
+tail = lst.split_at(len(lst) // 2)
+check_index(lst)
+check_index(tail)
+other = IndexedLinkedList()
+other.extend('abc')
+lst.splice(other, 1)
+lst.extend_from(tail)
+check_index(lst)
+check_index(other)
+check_index(tail)
+tc.assertEqual(0, other.count('a'))
+tc.assertEqual(1, lst.count('a'))
+
+plain = LinkedList()
+plain.extend_from(lst)
+tc.assertEqual({}, lst.nodes)
+lst.extend(plain)
+check_index(lst)
+tc.assertIsInstance(lst.copy(), IndexedLinkedList)
+check_index(lst.copy())
+
+# splicing in an unhashable value leaves both lists unchanged
+data = [x for x in lst]
+plain = LinkedList()
+plain.extend([3, [4], 5])
+with tc.assertRaises(TypeError):
+    lst.splice(plain, 2)
+tc.assertEqual(data, [x for x in lst])
+check_index(lst)
+tc.assertEqual([3, [4], 5], [x for x in plain])
+
+# removing from the middle doesn't scan
+lst = IndexedLinkedList()
+lst.extend(range(100000))
+lst.head.next.next.next = None
+lst.remove(99999)
+lst.remove(50000)
+tc.assertEqual(99998, len(lst))
+tc.assertFalse(50000 in lst)
+
+# sorting and merging relink the indexed nodes
+lst = IndexedLinkedList()
+lst.extend(random.sample(range(100), 100))
+other = IndexedLinkedList()
+other.extend(range(100, 110))
+lst.sort()
+lst.merge(other)
+tc.assertEqual(list(range(110)), [x for x in lst])
+tc.assertEqual(1, lst.count(105))
+tc.assertEqual(0, other.count(105))
+
+
+# In[ ]:
+
+
 
 
@@ -0,0 +1,100 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+"""Benchmarks `in` lookups on the self-organizing lists in linkedlist.py
+against a plain LinkedList, for Zipf-distributed lookups.
+
+The list holds n distinct symbols in random order, and the i-th most popular
+symbol is looked up with probability proportional to 1/i^s. The report shows
+the time per lookup, how that compares to the plain LinkedList, and the mean
+number of nodes visited per lookup over the second half of the lookups (by
+which time the self-organizing lists have adapted).
+
+Usage:
+
+    python linkedlist_bench.py [--sizes 100 1000 ...] [--lookups 100000] [--s 1.0]
+"""
+
+import argparse
+import random
+from time import perf_counter
+
+from linkedlist import LinkedList, SelfOrganizingList
+
+
+IMPLS = {
+    'LinkedList':    LinkedList,
+    'move-to-front': lambda: SelfOrganizingList('move-to-front'),
+    'transpose':     lambda: SelfOrganizingList('transpose'),
+    'count':         lambda: SelfOrganizingList('count'),
+}
+
+
+def zipf_lookups(n, k, s):
+    """Returns k symbols drawn from range(n), where the i-th most popular
+    symbol (in a random popularity order) is drawn with probability
+    proportional to 1/i^s."""
+    popularity = random.sample(range(n), n)
+    weights = [1 / (i ** s) for i in range(1, n + 1)]
+    return random.choices(popularity, weights, k=k)
+
+class Probe:
+    """A lookup value that counts the nodes it is compared against."""
+    def __init__(self):
+        self.val = None
+        self.visits = 0
+
+    def __eq__(self, other):
+        self.visits += 1
+        return other == self.val
+
+def mean_depth(make, order, lookups):
+    """Replays lookups on a fresh list built by make, holding the symbols in
+    order, and returns the mean number of nodes visited per lookup over the
+    second half of the lookups. As the lists reorganize deterministically,
+    this retraces the timed run."""
+    lst = make()
+    lst.extend(order)
+    half = len(lookups) // 2
+    for x in lookups[:half]:
+        x in lst
+    probe = Probe()
+    for x in lookups[half:]:
+        probe.val = x
+        probe in lst
+    return probe.visits / (len(lookups) - half)
+
+def measure(make, n, lookups):
+    """Looks up all of lookups in a fresh list of n symbols built by make, and
+    returns the time per lookup (in seconds) and the mean search depth over
+    the second half of the lookups (by which time the list has adapted)."""
+    order = random.sample(range(n), n)
+    lst = make()
+    lst.extend(order)
+    start = perf_counter()
+    for x in lookups:
+        x in lst
+    elapsed = (perf_counter() - start) / len(lookups)
+    return elapsed, mean_depth(make, order, lookups)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100, 1000, 10000])
+    parser.add_argument('--lookups', type=int, default=100000)
+    parser.add_argument('--s', type=float, default=1.0, help='Zipf exponent')
+    args = parser.parse_args()
+
+    print('{:<16}{:>8}{:>12}{:>12}{:>12}'.format('impl', 'n', 'us/lookup', 'x plain', 'mean depth'))
+    for n in args.sizes:
+        lookups = zipf_lookups(n, args.lookups, args.s)
+        baseline = None
+        for impl, make in IMPLS.items():
+            t, depth = measure(make, n, lookups)
+            if baseline is None:
+                baseline = t
+            print('{:<16}{:>8}{:>12.3f}{:>12.2f}{:>12.1f}'.format(impl, n, t * 1e6, t / baseline, depth))
+        print()
+
+
+if __name__ == '__main__':
+    main()